@@ -30,6 +30,11 @@ import sys
 import os
 import random
 import math
+import hashlib
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from functools import lru_cache
+import numpy as np
 import pygame
 import paho.mqtt.client as mqtt # For wireless button communication
 
@@ -58,6 +63,20 @@ WHEEL_SCALE_FACTOR = 2
 # 8192 is a safe limit for most modern graphics cards.
 MAX_RENDER_DIAMETER = 8192
 
+# Rotated copies of the wheel are cached so that idle and slow-moving frames skip the rotation.
+# The wheel angle is snapped to this step (in degrees); keep it small so the final settle stays smooth.
+ROTATION_CACHE_STEP_DEG = 0.1
+# How many rotated copies to keep. Each one uses about as much memory as the wheel image itself.
+ROTATION_CACHE_SIZE = 4
+
+# The generated wheel and its felt textures are saved here so later launches can load them instead of rebuilding them.
+# Set to None to disable the cache. Editing the settings a texture is drawn from (size, colors, wheel layout) makes a
+# new cache entry by itself; bump TEXTURE_CACHE_VERSION whenever the wheel or texture drawing code changes.
+# Whenever the wheel has to be rebuilt, cache files (and only those) that this launch didn't use are deleted;
+# any other files in the folder are left alone.
+TEXTURE_CACHE_DIR     = os.path.join(os.path.expanduser("~"), ".cache", "chuckaluck")
+TEXTURE_CACHE_VERSION = 3
+
 # --- WHEEL & SPIN PHYSICS ---
 NUM_PEGS            = 54      # Must match the length of WHEEL_RESULTS.
 MIN_SPINS           = 4       # Minimum number of full rotations for a spin. 4 default
@@ -72,6 +91,13 @@ SETTLE_WOBBLE_DEG   = 1.8     # The max angle of the wobble effect as the wheel
 SETTLE_WOBBLE_START = 0.75    # When to start the wobble (0.75 = during the last 25% of the spin).
 POINTER_JIGGLE_DURATION_SEC = 0.25 # How long the pointer jiggle animation lasts.
 POINTER_JIGGLE_STRENGTH_PX  = 8    # How much the pointer moves vertically.
+RAINBOW_HUE_STEP_DEG = 10          # Hue step of the rainbow result text; each step is rendered once per result.
+RAINBOW_SPEED_DEG_PER_SEC = 120.0  # How fast the result text cycles through the rainbow (360 = once a second).
+HIGHLIGHT_PULSE_SPEED = 12.0       # Speed of the winning segment's pulsing highlight (radians per second).
+RESULT_TITLE_BLINK_SEC = 0.25      # How long the "Winning Number" title stays on (and off) while blinking.
+
+# --- MQTT ---
+MQTT_RECONNECT_DELAY_SEC = 5.0     # Time between reconnect attempts if the broker connection drops.
 
 # --- FONTS ---
 # You can change these to any font installed on your system.
@@ -123,6 +149,26 @@ COLOR_PEG_BLACK_LIGHT = (40, 40, 40)
 COLOR_PEG_GREEN_DARK  = (0, 80, 0)
 COLOR_PEG_GREEN_LIGHT = (0, 150, 0)
 
+def _rainbow_color(hue):
+    """Returns the fully saturated (r, g, b) color for a hue in degrees."""
+    color = pygame.Color(0, 0, 0); color.hsva = (hue, 100, 100, 100)
+    return (color.r, color.g, color.b)
+
+# Lookup table of rainbow colors by whole hue degree (0-359), used for the animated result text.
+RAINBOW_COLORS = tuple(_rainbow_color(h) for h in range(360))
+
+COLOR_HISTORY_NEWEST = (255, 255, 255) # History lists fade from white for the newest result...
+COLOR_HISTORY_OLDEST = (139, 0, 0)     # ...to dark red for the oldest.
+
+def _history_fade(steps):
+    """Returns `steps` colors fading from COLOR_HISTORY_NEWEST to COLOR_HISTORY_OLDEST, one per history row."""
+    return tuple(tuple(int(a + (b - a) * (i/(steps-1))) for a, b in zip(COLOR_HISTORY_NEWEST, COLOR_HISTORY_OLDEST))
+                 for i in range(steps))
+
+# Row colors for the 'Last 5' and 'Last 45' history lists.
+HISTORY_COLORS_5  = _history_fade(5)
+HISTORY_COLORS_45 = _history_fade(45)
+
 
 # =============================================================================
 # --- WHEEL DATA ---
@@ -131,6 +177,9 @@ COLOR_PEG_GREEN_LIGHT = (0, 150, 0)
 # moving counter-clockwise. Special segments have been rearranged for balance.
 # (0,0,0) = House Wins, (9,9,9) = Spin Again
 # =============================================================================
+RESULT_HOUSE_WINS = (0, 0, 0)
+RESULT_SPIN_AGAIN = (9, 9, 9)
+
 WHEEL_RESULTS = [
     (4, 5, 6),
     (1, 2, 4), 
@@ -188,34 +237,80 @@ WHEEL_RESULTS = [
     (9, 9, 9)    # Spin Again
 ]
 
+def _segment_tally(result):
+    """Returns ((singles, doubles, triples), ((face, hits), ...), dice rolled) describing what one landing on `result` adds to the stats."""
+    if result == RESULT_HOUSE_WINS or result == RESULT_SPIN_AGAIN: return (1, 0, 0), (), 0
+    a, b, c = result
+    if a == b == c: combo = (0, 0, 1)
+    elif a == b or b == c or a == c: combo = (0, 1, 0)
+    else: combo = (1, 0, 0)
+    return combo, tuple(Counter(result).items()), 3
+
+def _result_label(result):
+    """Returns the display string for a wheel result, e.g. '1 - 2 - 4' or 'House Wins'."""
+    if result == RESULT_HOUSE_WINS: return "House Wins"
+    if result == RESULT_SPIN_AGAIN: return "Spin Again"
+    return f"{result[0]} - {result[1]} - {result[2]}"
+
+def _segment_color(result):
+    """Returns the die colour for a wheel result: black for House Wins, green for Spin Again, white otherwise."""
+    if result == RESULT_HOUSE_WINS: return COLOR_BLACK
+    if result == RESULT_SPIN_AGAIN: return COLOR_GREEN
+    return COLOR_WHITE
+
+# Per-segment stat increments, display strings and die colours, indexed like WHEEL_RESULTS.
+SEGMENT_TALLIES = tuple(_segment_tally(r) for r in WHEEL_RESULTS)
+SEGMENT_LABELS  = tuple(_result_label(r) for r in WHEEL_RESULTS)
+SEGMENT_COLORS  = tuple(_segment_color(r) for r in WHEEL_RESULTS)
+
+def _peg_colors(left, right):
+    """Returns the (dark, light) colours of the peg between two segments; pegs bordering a special segment take its colour."""
+    if RESULT_HOUSE_WINS in (left, right): return COLOR_PEG_BLACK_DARK, COLOR_PEG_BLACK_LIGHT
+    if RESULT_SPIN_AGAIN in (left, right): return COLOR_PEG_GREEN_DARK, COLOR_PEG_GREEN_LIGHT
+    return COLOR_DARK_GREY, COLOR_LIGHT_GREY # Metallic grey
+
+# Peg i sits on the divider at the start of segment i.
+PEG_COLORS = tuple(_peg_colors(WHEEL_RESULTS[i-1], WHEEL_RESULTS[i]) for i in range(NUM_PEGS))
+
 
 # ========= EASING =========
 # Functions that control the "feel" of animations by describing speed changes over time.
 # They take a progress value 'x' from 0.0 to 1.0 and return a modified value.
 
-def ease_out_cubic(x: float) -> float:
-    """Cubic easing: starts fast, slows down to a stop. Used for the main spin."""
-    return 1 - pow(1 - x, 3)
-
 def ease_in_out_quad(x: float) -> float:
     """Quadratic easing: starts slow, speeds up, then slows down. Used for wind-up."""
-    return 2 * x * x if x < 0.5 else 1 - pow(-2 * x + 2, 2) / 2
+    # Both halves of the curve (2x^2, then 1 - 2(1-x)^2) in one expression, measured from the midpoint.
+    d = x - 0.5
+    return 0.5 + 2 * d * (1 - abs(d))
+
+_BACK_C1 = 1.70158        # Overshoot amount for ease_out_back
+_BACK_C3 = _BACK_C1 + 1
 
 def ease_out_back(x: float) -> float:
     """
     "Back" easing creates an overshoot effect, like a bounce.
     Used for the pointer jiggle animation.
     """
-    c1 = 1.70158
-    c3 = c1 + 1
-    return 1 + c3 * pow(x - 1, 3) + c1 * pow(x - 1, 2)
+    # 1 + c3*y^3 + c1*y^2 with y = x - 1, factored to avoid pow()
+    y = x - 1
+    return 1 + y * y * (_BACK_C3 * y + _BACK_C1)
+
+# The wobble envelope only depends on the config above, so it is sampled once here.
+# Interpolating between 1024 steps keeps the error below a ten-thousandth of a degree.
+_WOBBLE_LUT_STEPS = 1024
+_WOBBLE_LUT = [SETTLE_WOBBLE_DEG * math.sin(math.pi * t) * math.exp(-3.0 * t)
+               for t in (i / _WOBBLE_LUT_STEPS for i in range(_WOBBLE_LUT_STEPS + 1))]
+_WOBBLE_LUT.append(_WOBBLE_LUT[-1]) # Pad so t == 1 can interpolate without a bounds check
 
 def end_wobble(u: float) -> float:
     """Calculates a dampened sine wave to create a "wobble" effect as the wheel settles."""
     if SETTLE_WOBBLE_DEG <= 0 or u < SETTLE_WOBBLE_START:
         return 0.0
     t = (u - SETTLE_WOBBLE_START) / (1 - SETTLE_WOBBLE_START)
-    return SETTLE_WOBBLE_DEG * math.sin(math.pi * t) * math.exp(-3.0 * t)
+    x = t * _WOBBLE_LUT_STEPS
+    i = int(x)
+    a = _WOBBLE_LUT[i]
+    return a + (_WOBBLE_LUT[i + 1] - a) * (x - i)
 
 # ========= UI HELPERS =========
 # Utility functions to simplify common Pygame drawing and UI creation.
@@ -224,29 +319,53 @@ def blit_center(surface, img, center):
     """Draws an image onto a surface, with the image's center at the specified coordinate."""
     surface.blit(img, img.get_rect(center=center))
 
-def draw_animated_pointer(surface, cx, cy, radius, anim_progress):
-    """Draws the triangular pointer, applying an animated 'jiggle' based on anim_progress."""
-    y_offset = POINTER_JIGGLE_STRENGTH_PX * ease_out_back(1.0 - anim_progress)
-    y_top = cy - radius - 20 + POINTER_JIGGLE_STRENGTH_PX - y_offset
+POINTER_BORDER_PAD = 2 # Room around the pre-rendered pointer for its 3px border
+
+def create_pointer_surface(radius):
+    """Pre-renders the triangular pointer (red fill, white border) once for a given wheel radius."""
     half_w = max(15, radius // 25)
-    
+    pad = POINTER_BORDER_PAD
     # --- COORDINATE SYSTEM NOTE ---
     # Pygame's Y-axis is inverted (0 is top, screen_height is bottom).
-    # The pointer is drawn physically at the top of the wheel.
-    # Its vertices are calculated relative to the wheel's center (cx, cy).
-    base_y = y_top + 35 # y_top is the highest point, so base_y is lower (larger Y value)
-    tip_y  = y_top + 15 # tip_y is higher than base_y (smaller Y value)
-
-    tip, left, right = (cx, tip_y), (cx - half_w, base_y), (cx + half_w, base_y)
-
-    pygame.draw.polygon(surface, (255, 0, 0), (tip, left, right))
-    pygame.draw.polygon(surface, COLOR_WHITE, (tip, left, right), width=3)
+    # The tip is the highest point of the surface; the base is 20px below it.
+    tip, left, right = (pad + half_w, pad), (pad, pad + 20), (pad + half_w*2, pad + 20)
+    pointer_surf = pygame.Surface((half_w*2 + pad*2 + 1, 20 + pad*2 + 1), pygame.SRCALPHA)
+    pygame.draw.polygon(pointer_surf, (255, 0, 0), (tip, left, right))
+    pygame.draw.polygon(pointer_surf, COLOR_WHITE, (tip, left, right), width=3)
+    return pointer_surf
+
+def draw_animated_pointer(surface, pointer_surf, cx, cy, radius, anim_progress):
+    """Blits the pre-rendered pointer above the wheel, applying an animated 'jiggle' based on anim_progress."""
+    y_offset = POINTER_JIGGLE_STRENGTH_PX * ease_out_back(1.0 - anim_progress)
+    y_top = cy - radius - 20 + POINTER_JIGGLE_STRENGTH_PX - y_offset
+    tip_y = y_top + 15 # The tip sits 15px below the top of the pointer's travel
+    surface.blit(pointer_surf, (cx - pointer_surf.get_width()//2, int(tip_y) - POINTER_BORDER_PAD))
+
+@lru_cache(maxsize=None)
+def _die_face(value, size, bg_color):
+    """Renders an upright die face; the wheel only uses six values in three colours, so each is drawn once."""
+    die_surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    size = int(size)
+    pygame.draw.rect(die_surface, bg_color, (0,0,size,size), border_radius=int(size*0.15))
+    if bg_color != COLOR_BLACK:
+        pygame.draw.rect(die_surface, COLOR_BLACK, (0,0,size,size), width=max(1,int(size*0.05)), border_radius=int(size*0.15))
+    margin = size * 0.2
+    c, r = size/2, size*0.12
+    dots = {1:[(c,c)], 2:[(margin,margin),(size-margin,size-margin)], 3:[(margin,margin),(c,c),(size-margin,size-margin)], 4:[(margin,margin),(size-margin,margin),(margin,size-margin),(size-margin,size-margin)], 5:[(margin,margin),(size-margin,margin),(c,c),(margin,size-margin),(size-margin,size-margin)], 6:[(margin,margin),(size-margin,margin),(margin,c),(size-margin,c),(margin,size-margin),(size-margin,size-margin)]}
+    if value in dots:
+        for pos in dots[value]: pygame.draw.circle(die_surface, COLOR_BLACK, pos, r)
+    return die_surface
+
+@lru_cache(maxsize=None)
+def _font(name, size, bold=False):
+    """Returns a shared SysFont; each lookup scans the system font list, so it is only done once per face."""
+    return pygame.font.SysFont(name, size, bold=bold)
 
 def create_payout_table():
     """Creates a pre-rendered Pygame surface for the payout and odds table."""
-    font_title  = pygame.font.SysFont("Arial Bold", FONT_SIZES["payout_title"])
-    font_header = pygame.font.SysFont(FONT_STATS, FONT_SIZES["payout_header"], bold=True)
-    font_body   = pygame.font.SysFont(FONT_STATS, FONT_SIZES["payout_body"])
+    font_title  = _font("Arial Bold", FONT_SIZES["payout_title"])
+    font_header = _font(FONT_STATS, FONT_SIZES["payout_header"], bold=True)
+    font_body   = _font(FONT_STATS, FONT_SIZES["payout_body"])
     table_data = [
         ("TRIPLE", "3 to 1", 1), ("DOUBLE", "2 to 1", 5), ("SINGLE", "1 to 1", 13),
         ("GREEN", "Push", 4), ("BLACK", "Lose Bet", 31)
@@ -271,21 +390,26 @@ def create_payout_table():
         blit_center(table_surf, s, (width/2, y + s.get_height()/2)); y += s.get_height()
     return table_surf
 
-def create_main_screen_stats_table(title, spin_counts, total_dice, total_spins):
+@lru_cache(maxsize=256)
+def _render_line(font_name, size, bold, text, color):
+    """Renders one line of table text; titles, headers, dividers and unchanged rows are reused between rebuilds."""
+    return _font(font_name, size, bold).render(text, True, color)
+
+def create_main_screen_stats_table(title, dice_counts, house_wins, spin_again, total_dice, total_spins):
     """Creates a compact stats table for the main game screen (e.g., 'Last 5 spins')."""
-    font_title  = pygame.font.SysFont("Arial Bold", FONT_SIZES["main_stats_title"])
-    font_header = pygame.font.SysFont(FONT_STATS, FONT_SIZES["main_stats_header"], bold=True)
-    font_body   = pygame.font.SysFont(FONT_STATS, FONT_SIZES["main_stats_body"])
-    title_surf  = font_title.render(title, True, (0, 200, 0))
-    header_surf = font_header.render("Result: Hits | Percent", True, (200, 200, 200))
+    font_title  = ("Arial Bold", FONT_SIZES["main_stats_title"], False)
+    font_header = (FONT_STATS, FONT_SIZES["main_stats_header"], True)
+    font_body   = (FONT_STATS, FONT_SIZES["main_stats_body"], False)
+    title_surf  = _render_line(*font_title, title, (0, 200, 0))
+    header_surf = _render_line(*font_header, "Result: Hits | Percent", (200, 200, 200))
     lines = []
     for i in range(1,7):
-        hits = spin_counts.get(i,0); pct = (hits/total_dice*100) if total_dice>0 else 0
-        lines.append(font_body.render(f"{i:<6}: {hits:>3} | {pct:5.1f}%", True, (255,255,255)))
-    lines.append(font_body.render("-"*23, True, (100,100,100)))
-    for label, color in [("House Wins",(255,100,100)), ("Spin Again",(200,200,200))]:
-        hits = spin_counts.get(label,0); pct = (hits/total_spins*100) if total_spins>0 else 0
-        lines.append(font_body.render(f"{label:<11}: {hits:>2} | {pct:5.1f}%", True, color))
+        hits = dice_counts[i]; pct = (hits/total_dice*100) if total_dice>0 else 0
+        lines.append(_render_line(*font_body, f"{i:<6}: {hits:>3} | {pct:5.1f}%", (255,255,255)))
+    lines.append(_render_line(*font_body, "-"*23, (100,100,100)))
+    for label, color, hits in [("House Wins",(255,100,100),house_wins), ("Spin Again",(200,200,200),spin_again)]:
+        pct = (hits/total_spins*100) if total_spins>0 else 0
+        lines.append(_render_line(*font_body, f"{label:<11}: {hits:>2} | {pct:5.1f}%", color))
     width  = header_surf.get_width() + 40
     height = title_surf.get_height() + header_surf.get_height() + sum(l.get_height() for l in lines) + 30
     table_surf = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -299,27 +423,27 @@ def create_main_screen_stats_table(title, spin_counts, total_dice, total_spins):
         blit_center(table_surf, l, (width/2, y + l.get_height()/2)); y += l.get_height()
     return table_surf
 
-def create_full_stats_table_surface(title, spin_counts, total_dice, total_spins, combo_counts):
+def create_full_stats_table_surface(title, dice_counts, house_wins, spin_again, total_dice, total_spins, combo_counts):
     """Creates the larger, more detailed stats table for the dedicated statistics screen."""
-    font_title  = pygame.font.SysFont("Arial Bold", FONT_SIZES["full_stats_title"])
-    font_header = pygame.font.SysFont(FONT_STATS, FONT_SIZES["full_stats_header"], bold=True)
-    font_body   = pygame.font.SysFont(FONT_STATS, FONT_SIZES["full_stats_body"])
-    title_surf  = font_title.render(title, True, (0,200,0))
-    header_surf = font_header.render("Result: Hits | Percent", True, (200,200,200))
+    font_title  = ("Arial Bold", FONT_SIZES["full_stats_title"], False)
+    font_header = (FONT_STATS, FONT_SIZES["full_stats_header"], True)
+    font_body   = (FONT_STATS, FONT_SIZES["full_stats_body"], False)
+    title_surf  = _render_line(*font_title, title, (0,200,0))
+    header_surf = _render_line(*font_header, "Result: Hits | Percent", (200,200,200))
     lines=[]
     for i in range(1,7):
-        hits = spin_counts.get(i,0); pct = (hits/total_dice*100) if total_dice>0 else 0
-        lines.append(font_body.render(f"{i:<6}: {hits:>4} | {pct:5.1f}%", True, (255,255,255)))
-    lines.append(font_body.render("-"*22, True, (100,100,100)))
-    for label,color in [("House Wins",(255,100,100)),("Spin Again",(200,200,200))]:
-        hits = spin_counts.get(label,0); pct = (hits/total_spins*100) if total_spins>0 else 0
-        lines.append(font_body.render(f"{label:<11}: {hits:>4} | {pct:5.1f}%", True, color))
+        hits = dice_counts[i]; pct = (hits/total_dice*100) if total_dice>0 else 0
+        lines.append(_render_line(*font_body, f"{i:<6}: {hits:>4} | {pct:5.1f}%", (255,255,255)))
+    lines.append(_render_line(*font_body, "-"*22, (100,100,100)))
+    for label,color,hits in [("House Wins",(255,100,100),house_wins),("Spin Again",(200,200,200),spin_again)]:
+        pct = (hits/total_spins*100) if total_spins>0 else 0
+        lines.append(_render_line(*font_body, f"{label:<11}: {hits:>4} | {pct:5.1f}%", color))
     if combo_counts:
-        lines.append(font_body.render("-"*22, True, (100,100,100)))
-        total_combos = sum(combo_counts.values())
-        for label,color in [("Singles",(255,255,255)),("Doubles",(255,255,100)),("Triples",(100,255,100))]:
-            hits = combo_counts.get(label,0); pct = (hits/total_combos*100) if total_combos>0 else 0
-            lines.append(font_body.render(f"{label:<8}: {hits:>4} | {pct:5.1f}%", True, color))
+        lines.append(_render_line(*font_body, "-"*22, (100,100,100)))
+        total_combos = sum(combo_counts)
+        for (label,color),hits in zip([("Singles",(255,255,255)),("Doubles",(255,255,100)),("Triples",(100,255,100))], combo_counts):
+            pct = (hits/total_combos*100) if total_combos>0 else 0
+            lines.append(_render_line(*font_body, f"{label:<8}: {hits:>4} | {pct:5.1f}%", color))
     width  = header_surf.get_width() + 60
     height = title_surf.get_height() + header_surf.get_height() + sum(l.get_height() for l in lines) + 40
     table_surf = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -333,6 +457,17 @@ def create_full_stats_table_surface(title, spin_counts, total_dice, total_spins,
         blit_center(table_surf, l, (width/2, y + l.get_height()/2)); y += l.get_height()
     return table_surf
 
+def create_history_list_surface(font, results):
+    """Pre-renders the right-aligned 'Last 5 Results' list, fading from white to dark red."""
+    lines = [font.render(f"{i+1}.  {s}", True, HISTORY_COLORS_5[i]) for i, s in enumerate(results)]
+    width  = max(l.get_width() for l in lines)
+    height = sum(l.get_height() for l in lines)
+    list_surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    y = 0
+    for l in lines:
+        list_surf.blit(l, l.get_rect(topright=(width, y))); y += l.get_height()
+    return list_surf
+
 # ========= FELT / BAIZE TEXTURE HELPERS =========
 # This suite of functions procedurally generates a realistic felt-like texture.
 # It builds the texture in layers: grain, fibers, weave, and vignette.
@@ -344,24 +479,21 @@ def _circle_mask(size, center, radius):
     return surf
 
 def _apply_alpha_mask(src, mask):
-    """Applies a mask to a source surface, making areas outside the mask transparent."""
-    out = pygame.Surface(src.get_size(), pygame.SRCALPHA)
-    out.blit(src, (0,0))
-    out.blit(mask, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
-    return out
+    """Applies a mask to a source surface in place, making areas outside the mask transparent. Returns the source."""
+    src.blit(mask, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
+    return src
 
 def _felt_grain(size, base_color, density=0.98, alpha=14, seed=0):
     """Generates fine, random pixel noise to simulate felt grain."""
-    random.seed(seed)
+    rng = np.random.default_rng(seed)
     w, h = size
     surf = pygame.Surface((w, h), pygame.SRCALPHA)
     n = int(w*h*0.0075*density)
-    br, bg, bb = base_color
-    for _ in range(n):
-        x = random.randrange(w); y = random.randrange(h)
-        dv = random.randint(-10, 10) # brightness variation
-        col = (max(0,min(255, br+dv)), max(0,min(255,bg+dv)), max(0,min(255,bb+dv)), alpha)
-        surf.fill(col, (x, y, 1, 1))
+    xs = rng.integers(0, w, n); ys = rng.integers(0, h, n)
+    dv = rng.integers(-10, 11, n) # brightness variation
+    # All grain pixels are written in one go through arrays that view the surface's pixels.
+    pygame.surfarray.pixels3d(surf)[xs, ys] = np.clip(np.array(base_color) + dv[:, None], 0, 255)
+    pygame.surfarray.pixels_alpha(surf)[xs, ys] = alpha
     return surf
 
 def _felt_fibers(size, base_color, angle_deg=25, length=10, thickness=1, count_scale=1.0, alpha=18, seed=1):
@@ -384,33 +516,33 @@ def _soft_vignette(size, center, radius, strength=0.12):
     """Creates a soft, dark radial gradient to simulate depth and shadow."""
     w, h = size
     surf = pygame.Surface((w, h), pygame.SRCALPHA)
-    steps = max(8, int(radius*0.2))
-    for i in range(steps):
-        t = i/(steps-1)
-        r = int(radius*(t))
-        a = int(255 * (t**2) * strength) # Alpha increases quadratically for a soft edge
-        pygame.draw.circle(surf, (0,0,0,a), center, r)
+    dx = np.arange(w, dtype=np.float32)[:, None] - center[0]
+    dy = np.arange(h, dtype=np.float32)[None, :] - center[1]
+    t2 = (dx*dx + dy*dy) / (radius*radius) # Squared distance from the center, as a fraction of the radius
+    a = 255 * strength * np.minimum(t2, 1) # Alpha increases quadratically for a soft edge; callers clip it to the circle
+    pygame.surfarray.pixels_alpha(surf)[...] = a.astype(np.uint8)
     return surf
 
-def make_felt_patch(size, center, radius, base_color, seed=0):
-    """Builds a complete felt/baize texture patch by layering multiple effects."""
+def make_felt_patch(size, center, radius, base_color, seed=0, scale_factor=1):
+    """Builds a complete felt/baize texture patch by layering multiple effects; scale_factor is the supersampling of `size`."""
     patch = pygame.Surface(size, pygame.SRCALPHA)
     # 1. Base color fill
     pygame.draw.circle(patch, (*base_color, 255), center, radius)
+    mask = _circle_mask(size, center, radius) # Clips every layer below to the patch
 
     # 2. Fine grain noise
     grain = _felt_grain(size, base_color, density=0.58, alpha=14, seed=seed)
-    grain = _apply_alpha_mask(grain, _circle_mask(size, center, radius))
+    grain = _apply_alpha_mask(grain, mask)
     patch.blit(grain, (0,0))
 
     # 3. Fibers (two passes at different angles for realism)
     fib_len = max(8, radius//18)
     fib1 = _felt_fibers(size, base_color, angle_deg=22,  length=fib_len, thickness=1, count_scale=1.0, alpha=16, seed=seed+11)
-    fib1 = _apply_alpha_mask(fib1, _circle_mask(size, center, radius))
+    fib1 = _apply_alpha_mask(fib1, mask)
     patch.blit(fib1, (0,0))
 
     fib2 = _felt_fibers(size, base_color, angle_deg=112, length=fib_len, thickness=1, count_scale=0.8, alpha=12, seed=seed+23)
-    fib2 = _apply_alpha_mask(fib2, _circle_mask(size, center, radius))
+    fib2 = _apply_alpha_mask(fib2, mask)
     patch.blit(fib2, (0,0))
 
     # 4. Subtle cross-hatch weave pattern
@@ -421,30 +553,74 @@ def make_felt_patch(size, center, radius, base_color, seed=0):
     cx, cy = center
     for x in range(cx-radius, cx+radius, step): pygame.draw.line(weave, weave_col, (x, cy-radius), (x, cy+radius), 1)
     for y in range(cy-radius, cy+radius, step): pygame.draw.line(weave, weave_col, (cx-radius, y), (cx+radius, y), 1)
-    weave = _apply_alpha_mask(weave, _circle_mask(size, center, radius))
+    weave = _apply_alpha_mask(weave, mask)
     patch.blit(weave, (0,0))
 
     # 5. Vignette for depth and 'pile' shadow
-    vig = _soft_vignette(size, center, radius, strength=0.12)
-    vig = _apply_alpha_mask(vig, _circle_mask(size, center, radius))
+    # A smooth gradient gains nothing from supersampling, so it is computed at display size and scaled up.
+    k = scale_factor
+    vig = _soft_vignette((round(size[0]/k), round(size[1]/k)), (center[0]/k, center[1]/k), radius/k, strength=0.12)
+    vig = pygame.transform.scale(vig, size)
+    vig = _apply_alpha_mask(vig, mask)
     patch.blit(vig, (0,0))
 
     return patch
 
+# Paths of the cached textures used by this launch, which prune_texture_cache() keeps,
+# and the texture names seen, which tell it which other files in the folder are cache files.
+_texture_cache_used = set()
+_texture_cache_names = set()
+
+def cached_texture(name, key, build):
+    """
+    Returns the surface made by `build()`, going through an on-disk PNG cache.
+    `key` must capture every input of `build`, including any module-level settings it reads; it is hashed into the file name.
+    """
+    if not TEXTURE_CACHE_DIR: return build()
+    digest = hashlib.blake2b(repr((TEXTURE_CACHE_VERSION, name, key)).encode(), digest_size=8).hexdigest()
+    path = os.path.join(TEXTURE_CACHE_DIR, f"{name}_{digest}.png")
+    _texture_cache_used.add(path)
+    _texture_cache_names.add(name)
+    if os.path.exists(path):
+        try: return pygame.image.load(path)
+        except pygame.error as e: print(f"Warning: Could not load cached texture '{path}'. Error: {e}")
+    surf = build()
+    try:
+        os.makedirs(TEXTURE_CACHE_DIR, exist_ok=True)
+        pygame.image.save(surf, path)
+    except (OSError, pygame.error) as e: print(f"Warning: Could not cache texture '{path}'. Error: {e}")
+    return surf
+
+def _is_texture_cache_file(filename):
+    """Whether a file name has the form cached_texture() writes: '<name>_<16 hex digits>.png' for a known texture name."""
+    stem, ext = os.path.splitext(filename)
+    name, _, digest = stem.rpartition("_")
+    return ext == ".png" and name in _texture_cache_names and len(digest) == 16 and all(c in "0123456789abcdef" for c in digest)
+
+def prune_texture_cache():
+    """Deletes the cached textures this launch hasn't used, such as those left by another window size, config or cache version."""
+    if not TEXTURE_CACHE_DIR or not os.path.isdir(TEXTURE_CACHE_DIR): return
+    # TEXTURE_CACHE_DIR is user-configurable, so only ever touch files this cache wrote.
+    for entry in os.scandir(TEXTURE_CACHE_DIR):
+        if entry.is_file() and _is_texture_cache_file(entry.name) and entry.path not in _texture_cache_used:
+            try: os.remove(entry.path)
+            except OSError as e: print(f"Warning: Could not remove stale texture '{entry.path}'. Error: {e}")
+
 # ========= STAR RENDERING (two-layer with depth) =========
 # This suite of functions procedurally generates a high-detail, 2.5D metallic star.
 # It uses layers, gradients, masks, and generated textures to create a sense of depth and realism.
 
+@lru_cache(maxsize=None)
+def _star_directions(num_points, rotation_deg):
+    """Returns the unit vectors from a star's center to each of its vertices, computed once per star shape."""
+    steps = num_points * 2
+    return tuple((math.cos(ang), math.sin(ang)) for ang in (math.radians(i * (360.0 / steps) + rotation_deg) for i in range(steps)))
+
 def _regular_star_points(center, r_outer, r_inner, num_points=10, rotation_deg=-90):
     """Calculates the vertex points for a standard n-pointed star."""
     cx, cy = center
-    pts = []
-    steps = num_points * 2
-    for i in range(steps):
-        r = r_outer if i % 2 == 0 else r_inner # Alternate between outer and inner radius
-        ang = math.radians(i * (360.0 / steps) + rotation_deg)
-        pts.append((cx + r * math.cos(ang), cy + r * math.sin(ang)))
-    return pts
+    radii = (r_outer, r_inner) # Alternate between outer and inner radius
+    return [(cx + radii[i % 2] * dx, cy + radii[i % 2] * dy) for i, (dx, dy) in enumerate(_star_directions(num_points, rotation_deg))]
 
 def _polygon(surface, color, points, width=0):
     """A simple wrapper for pygame.draw.polygon for convenience."""
@@ -456,50 +632,42 @@ def _mask_from_polygon(size, points):
     _polygon(m, (255,255,255,255), points)
     return m
 
-def _apply_mask_rgba(src_surf, mask_surf):
-    """Applies a mask to a source, similar to _apply_alpha_mask but with a different name."""
-    out = pygame.Surface(src_surf.get_size(), pygame.SRCALPHA)
-    out.blit(src_surf, (0,0))
-    out.blit(mask_surf, (0,0), special_flags=pygame.BLEND_RGBA_MULT)
-    return out
-
 def _radial_gradient(size, center, r_outer, inner_color, outer_color):
-    """Draws a radial gradient by drawing concentric circles of changing color."""
+    """Draws a radial gradient, coloring each pixel by its distance from the center."""
     w,h = size
     grad = pygame.Surface((w,h), pygame.SRCALPHA)
     max_r = max(1, int(r_outer))
-    for i in range(max_r, -1, -1):
-        t = i/max_r # progress from outer (0.0) to inner (1.0)
-        # Linear interpolation for each color channel
-        r = int(outer_color[0] + (inner_color[0]-outer_color[0])*(1-t))
-        g = int(outer_color[1] + (inner_color[1]-outer_color[1])*(1-t))
-        b = int(outer_color[2] + (inner_color[2]-outer_color[2])*(1-t))
-        a = int(outer_color[3] + (inner_color[3]-outer_color[3])*(1-t))
-        pygame.draw.circle(grad, (r,g,b,a), center, i)
+    # Only the square around the gradient's circle needs computing.
+    cx, cy = int(center[0]), int(center[1])
+    x0, x1 = max(0, cx-max_r), min(w, cx+max_r+1)
+    y0, y1 = max(0, cy-max_r), min(h, cy+max_r+1)
+    dx = np.arange(x0, x1, dtype=np.float32)[:, None] - center[0]
+    dy = np.arange(y0, y1, dtype=np.float32)[None, :] - center[1]
+    ring = np.ceil(np.sqrt(dx*dx + dy*dy)).astype(np.int32) # Smallest whole-pixel radius covering each pixel
+    if ring.size == 0: return grad # The circle lies entirely off the surface
+
+    # One packed pixel value per ring radius; rings beyond r_outer (the square's corners) stay transparent.
+    t = np.arange(max_r+1) / max_r # progress from outer (0.0) to inner (1.0)
+    inner = np.array(inner_color, dtype=float); outer = np.array(outer_color, dtype=float)
+    channels = (outer + (inner - outer) * (1 - t)[:, None]).astype(np.uint32)
+    # The surface may clip the circle, so the table must cover both the rings present and the full gradient.
+    ring_pixels = np.zeros(max(int(ring.max()), max_r)+1, np.uint32)
+    for c, shift in enumerate(grad.get_shifts()): ring_pixels[:max_r+1] |= channels[:, c] << np.uint32(shift)
+    pygame.surfarray.pixels2d(grad)[x0:x1, y0:y1] = np.take(ring_pixels, ring)
     return grad
 
 def _brushed_metal(size, strength=26, alpha=55, seed=777):
     """Generates a texture of horizontal lines to simulate brushed metal."""
-    random.seed(seed)
+    rng = np.random.default_rng(seed)
     w,h = size
     tex = pygame.Surface((w,h), pygame.SRCALPHA)
-    for y in range(0, h, max(1, h//160)):
-        brightness = 185 + random.randint(-strength, strength)
-        brightness = max(95, min(235, brightness)) # Clamp brightness
-        pygame.draw.line(tex, (brightness,brightness,brightness,alpha), (0,y), (w,y))
+    rows = np.arange(0, h, max(1, h//160))
+    brightness = np.clip(185 + rng.integers(-strength, strength+1, rows.size), 95, 235) # Clamp brightness
+    # Every line is filled at once through arrays that view the surface's pixels.
+    pygame.surfarray.pixels3d(tex)[:, rows] = brightness[None, :, None]
+    pygame.surfarray.pixels_alpha(tex)[:, rows] = alpha
     return tex
 
-def _soft_glow_star(size, center, r_outer, color=(255, 235, 120, 90)):
-    """Creates a soft, diffuse glow effect using layered circles of decreasing alpha."""
-    glow = pygame.Surface(size, pygame.SRCALPHA)
-    steps = 20
-    for i in range(steps):
-        t = i/(steps-1)
-        r = int(r_outer * (1.20 + 0.45*t)) # Glow extends beyond the star
-        a = max(0, int(color[3] * (1.0 - t))) # Alpha fades to zero
-        pygame.draw.circle(glow, (color[0],color[1],color[2],a), center, r)
-    return glow
-
 def _offset(points, dx, dy):
     """Returns a new list of points, each offset by dx, dy."""
     return [(x+dx, y+dy) for x,y in points]
@@ -522,11 +690,11 @@ def draw_two_layer_star(target, center, r_outer_base, r_inner_base, scale_factor
     # Gradient base for the back star
     back_grad = _radial_gradient(size, local_center, r_outer_base,
                                  inner_color=(160,160,160,255), outer_color=(40,40,40,255))
-    back_grad  = _apply_mask_rgba(back_grad, back_mask)
+    back_grad  = _apply_alpha_mask(back_grad, back_mask)
 
     # Brushed metal texture on top of the gradient
     back_metal = _brushed_metal(size, strength=22, alpha=45, seed=515)
-    back_metal = _apply_mask_rgba(back_metal, back_mask)
+    back_metal = _apply_alpha_mask(back_metal, back_mask)
     back_grad.blit(back_metal, (0,0))
 
     # Bevel effect using offset light/dark outlines
@@ -534,7 +702,7 @@ def draw_two_layer_star(target, center, r_outer_base, r_inner_base, scale_factor
     thick = max(2, int(4*scale_factor))
     _polygon(back_bevel, (255,255,255,110), _offset(back_points, -2*scale_factor, -2*scale_factor), width=thick) # Highlight
     _polygon(back_bevel, (0,0,0,140),       _offset(back_points,  2*scale_factor,  2*scale_factor), width=thick) # Shadow
-    back_bevel = _apply_mask_rgba(back_bevel, back_mask)
+    back_bevel = _apply_alpha_mask(back_bevel, back_mask)
     back_grad.blit(back_bevel, (0,0))
 
     # Inset polygon to create a sharp inner edge
@@ -550,10 +718,7 @@ def draw_two_layer_star(target, center, r_outer_base, r_inner_base, scale_factor
     _polygon(shadow, (0,0,0,130), _offset(back_points, 5*scale_factor, 5*scale_factor))
     target.blit(shadow, (cx - R, cy - R))
 
-    # --- 3. SOFT GLOW ---
-    target.blit(_soft_glow_star(size, local_center, r_outer_base*0.92, color=(255, 235, 150, 90)), (cx - R, cy - R))
-
-    # --- 4. FRONT STAR (LIGHTER, SMALLER) ---
+    # --- 3. FRONT STAR (LIGHTER, SMALLER) ---
     front_scale = 0.90 # Front star is 90% the size of the back one
     r_outer_front = r_outer_base * front_scale
     r_inner_front = r_inner_base * front_scale
@@ -564,23 +729,23 @@ def draw_two_layer_star(target, center, r_outer_base, r_inner_base, scale_factor
     # Gradient, metal, and bevels for the front star (similar to back star but with lighter colors)
     front_grad = _radial_gradient(size, local_center, r_outer_front,
                                   inner_color=(255,245,205,255), outer_color=(120,90,25,255))
-    front_grad = _apply_mask_rgba(front_grad, front_mask)
+    front_grad = _apply_alpha_mask(front_grad, front_mask)
 
     front_metal = _brushed_metal(size, strength=28, alpha=55, seed=913)
-    front_metal = _apply_mask_rgba(front_metal, front_mask)
+    front_metal = _apply_alpha_mask(front_metal, front_mask)
     front_grad.blit(front_metal, (0,0))
 
     thick_f = max(2, int(4*scale_factor))
     front_bevel = pygame.Surface(size, pygame.SRCALPHA)
     _polygon(front_bevel, (255,255,255,150), _offset(front_points, -2*scale_factor, -2*scale_factor), width=thick_f)
     _polygon(front_bevel, (0,0,0,130),       _offset(front_points,  2*scale_factor,  2*scale_factor), width=thick_f)
-    front_bevel = _apply_mask_rgba(front_bevel, front_mask)
+    front_bevel = _apply_alpha_mask(front_bevel, front_mask)
     front_grad.blit(front_bevel, (0,0))
 
     # Blit the finished front star
     target.blit(front_grad, (cx - R, cy - R))
 
-    # --- 5. CENTER HUB ---
+    # --- 4. CENTER HUB ---
     hub_r = int(r_outer_front * 0.22)
     pygame.draw.circle(target, (235,235,235), (cx,cy), hub_r)
     pygame.draw.circle(target, (50,50,50), (cx,cy), hub_r, width=max(2, int(3*scale_factor)))
@@ -617,11 +782,18 @@ class Game:
         # --- Geometry, Assets, and State Initialization ---
         self.cx, self.cy = self.WINDOW_SIZE[0]//2, self.WINDOW_SIZE[1]//2
         self.seg_angle = 360.0/NUM_PEGS
+        self.segs_per_degree = NUM_PEGS/360.0 # Reciprocal of seg_angle, so per-frame code can multiply instead of divide
+        # Wheel rotation that puts the center of segment k under the top pointer (270 degrees).
+        self.segment_rest_angles = tuple(270 - (k + 0.5) * self.seg_angle for k in range(NUM_PEGS))
         self._load_assets()
         self._init_fonts()
         self._prerender_text()
 
         self.payout_table_surf = create_payout_table()
+        self.pointer_surf = create_pointer_surface(self.wheel_radius)
+        self.game_background = self._create_game_background()
+        self.stats_background = self._create_stats_background()
+        self.highlight_surf = self._create_highlight_surface()
 
         # --- Animation State ---
         self.animation_state = "idle"  # "idle", "winding_up", "spinning"
@@ -629,52 +801,75 @@ class Game:
         self.current_angle = 0.0
         self.rest_angle = 0.0
         self.final_angle_base = 0.0
+        self.spin_start_angle = 0.0    # Angle at the end of the wind-up, where the spin begins
+        self.spin_rotation = 0.0       # Total rotation from spin_start_angle to final_angle_base
         self.current_spin_duration = 0.0
 
         # --- Game Logic State ---
         self.current_screen = "game"  # "game" or "stats"
+        self.stats_screen_dirty = True # The stats screen is static, so it is only redrawn when this is set
+        self.game_screen_dirty = True  # Likewise for the game screen while nothing on it is animating
         self.last_tick_idx = None
         self.result_display_text = ""
         self.test_mode = False
         self.test_index = 0
         self.winning_segment_index = None # New state to track the winner for highlighting
+        # Spins draw from their own generator: the felt and star texture helpers reseed the
+        # module-level one with fixed seeds while the assets are built.
+        self.rng = random.Random()
 
         # --- Visual Effect State ---
-        self.rainbow_hue = 0
-        self.flash_timer = 0
+        self.rainbow_hue = 0.0
+        self.result_surf_text = ""     # The result text that result_surf_cache was rendered for
+        self.result_surf_cache = {}    # Hue step -> rendered rainbow result text
+        self.test_pos_surf = None      # Cached "Position: N" overlay for test mode
+        self.test_pos_index = None
+        self.flash_timer = 0.0         # Seconds spent on the game screen; drives the pulsing and blinking effects
         self.pointer_anim_progress = 1.0 # New state for pointer animation (1.0 = finished)
 
         # --- Statistics Tracking ---
-        self.results_history_full = []
-        self.spin_counts_full = {i:0 for i in range(1,7)}
-        self.spin_counts_full.update({"House Wins":0,"Spin Again":0})
-        self.combo_counts_full = {"Singles":0,"Doubles":0,"Triples":0}
+        self.results_history_full = deque(maxlen=45) # Newest first, as (result tuple, display string) pairs
+        self.dice_counts_full = [0]*7 # Hits per die face, indexed 1-6 (index 0 is unused)
+        self.house_wins_full = 0
+        self.spin_again_full = 0
+        self.singles_full = 0
+        self.doubles_full = 0
+        self.triples_full = 0
         self.total_dice_rolled_full = 0
         self.total_spins_full = 0
         self.last_5_stats_surf = None
+        self.last_5_history_surf = None
+        self.history_rows = None       # (surface, position) for each row of the 'Last 45' list; rebuilt after the history changes
+        self.full_stats_surf = None    # Stats screen table and total; like history_rows, rebuilt on demand after a spin
+        self.total_spins_surf = None
         self._update_on_screen_stats()
 
         self._setup_mqtt()
 
     def draw_die(self, surface, value, center_pos, size, angle_deg, bg_color):
         """Draws a single die face, rotated to point radially outward."""
-        die_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-        size = int(size)
-        pygame.draw.rect(die_surface, bg_color, (0,0,size,size), border_radius=int(size*0.15))
-        if bg_color != COLOR_BLACK:
-            pygame.draw.rect(die_surface, COLOR_BLACK, (0,0,size,size), width=max(1,int(size*0.05)), border_radius=int(size*0.15))
-        margin = size * 0.2
-        c, r = size/2, size*0.12
-        dots = {1:[(c,c)], 2:[(margin,margin),(size-margin,size-margin)], 3:[(margin,margin),(c,c),(size-margin,size-margin)], 4:[(margin,margin),(size-margin,margin),(margin,size-margin),(size-margin,size-margin)], 5:[(margin,margin),(size-margin,margin),(c,c),(margin,size-margin),(size-margin,size-margin)], 6:[(margin,margin),(size-margin,margin),(margin,c),(size-margin,c),(margin,size-margin),(size-margin,size-margin)]}
-        if value in dots:
-            for pos in dots[value]: pygame.draw.circle(die_surface, COLOR_BLACK, pos, r)
+        die_surface = _die_face(value, size, bg_color)
         rotated = pygame.transform.rotate(die_surface, -angle_deg)
         surface.blit(rotated, rotated.get_rect(center=center_pos))
 
     def create_wheel_surface(self):
+        """Returns the wheel graphic, reusing the on-disk copy from an earlier run with the same size, layout and colors."""
+        # Every module-level setting the wheel is drawn from (including by draw_die), so a config edit always rebuilds it.
+        # SEGMENT_COLORS and PEG_COLORS carry COLOR_GREEN, the greys and the COLOR_PEG_* values.
+        key = (self.wheel_radius, WHEEL_SCALE_FACTOR, MAX_RENDER_DIAMETER, NUM_PEGS, tuple(WHEEL_RESULTS),
+               SEGMENT_COLORS, PEG_COLORS, COLOR_BLACK, COLOR_WHITE)
+        return cached_texture("wheel", key, self._build_wheel_surface)
+
+    def _build_wheel_surface(self):
+        """Renders the wheel on a texture cache miss, then clears out cached files left over from other sizes or settings."""
+        surf = self._render_wheel_surface()
+        prune_texture_cache()
+        return surf
+
+    def _render_wheel_surface(self):
         """
         Constructs the entire wheel graphic procedurally.
-        This function is called once at startup to create the wheel surface.
+        This function is called once at startup (on a cold texture cache) to create the wheel surface.
         It uses a high-resolution canvas (scale_factor) and then downsamples
         for anti-aliasing.
         """
@@ -703,7 +898,8 @@ class Game:
         # 1. Red outer rim felt
         rim_radius = scaled_radius
         red_base   = (170, 10, 10) # A richer red for better texture readability
-        red_felt   = make_felt_patch((scaled_diameter, scaled_diameter), wheel_center, rim_radius, red_base, seed=101)
+        red_key    = ((scaled_diameter, scaled_diameter), wheel_center, rim_radius, red_base, 101, scale_factor)
+        red_felt   = cached_texture("felt", red_key, lambda: make_felt_patch(*red_key))
         wheel_surf.blit(red_felt, (0,0))
         # 2. Black outer border ring (drawn on top of the felt)
         pygame.draw.circle(wheel_surf, COLOR_BLACK, wheel_center, scaled_radius, int(15*scale_factor))
@@ -711,7 +907,8 @@ class Game:
         # 3. Center casino-green felt
         center_radius = int(scaled_radius * 0.55)
         green_base    = (0, 105, 35) # A slightly brighter green for texture
-        green_felt    = make_felt_patch((scaled_diameter, scaled_diameter), wheel_center, center_radius, green_base, seed=202)
+        green_key     = ((scaled_diameter, scaled_diameter), wheel_center, center_radius, green_base, 202, scale_factor)
+        green_felt    = cached_texture("felt", green_key, lambda: make_felt_patch(*green_key))
         wheel_surf.blit(green_felt, (0,0))
 
         # ===== WHEEL STRUCTURE =====
@@ -720,14 +917,14 @@ class Game:
         pygame.draw.circle(wheel_surf, COLOR_BLACK, wheel_center, int(inner_ring_radius), width=int(8*scale_factor))
 
         # 5. Segment dividing lines
+        # Unit vectors along each divider; the peg studs in step 7 sit on the same spokes.
+        spokes = [(math.cos(th), math.sin(th)) for th in (math.radians(i*angle_step) for i in range(NUM_PEGS))]
         peg_outer_radius = scaled_radius - (8*scale_factor)
-        for i in range(NUM_PEGS):
-            th = math.radians(i*angle_step)
-            x_outer = wheel_center[0] + peg_outer_radius*math.cos(th)
-            y_outer = wheel_center[1] + peg_outer_radius*math.sin(th)
-            x_inner = wheel_center[0] + inner_ring_radius*math.cos(th)
-            y_inner = wheel_center[1] + inner_ring_radius*math.sin(th)
-            pygame.draw.line(wheel_surf, COLOR_BLACK, (x_outer,y_outer), (x_inner,y_inner), int(2*scale_factor))
+        line_width = int(2*scale_factor)
+        for ux, uy in spokes:
+            outer = (wheel_center[0] + peg_outer_radius*ux, wheel_center[1] + peg_outer_radius*uy)
+            inner = (wheel_center[0] + inner_ring_radius*ux, wheel_center[1] + inner_ring_radius*uy)
+            pygame.draw.line(wheel_surf, COLOR_BLACK, outer, inner, line_width)
 
         # ===== DICE & PEGS =====
         # 6. Dice, positioned in three concentric rings
@@ -736,45 +933,26 @@ class Game:
         for i in range(NUM_PEGS):
             center_angle_deg = (i*angle_step) + (angle_step/2)
             ang = math.radians(center_angle_deg)
+            ux, uy = math.cos(ang), math.sin(ang)
             dice_values = WHEEL_RESULTS[i]
-            seg_color = COLOR_WHITE
-            if dice_values == (0,0,0): seg_color = COLOR_BLACK
-            elif dice_values == (9,9,9): seg_color = COLOR_GREEN
+            seg_color = SEGMENT_COLORS[i]
+            # Every die in the segment lies on the ray at center_angle_deg, so that is also its angle to the center.
             for j in range(3):
                 d = radii[j]
-                x = wheel_center[0] + d*math.cos(ang)
-                y = wheel_center[1] + d*math.sin(ang)
-                ang_to_center = math.degrees(math.atan2(y-wheel_center[1], x-wheel_center[0]))
-                self.draw_die(wheel_surf, dice_values[j], (x,y), die_size, ang_to_center+90, seg_color)
+                x = wheel_center[0] + d*ux
+                y = wheel_center[1] + d*uy
+                self.draw_die(wheel_surf, dice_values[j], (x,y), die_size, center_angle_deg+90, seg_color)
 
         # 7. Peg studs on the dividing lines
         peg_radius = int(self.wheel_radius*0.017) * scale_factor
         peg_ring   = scaled_radius - (8*scale_factor)
-        for i in range(NUM_PEGS):
-            # --- New Peg Coloring Logic ---
-            # Check the segments on either side of the current peg
-            left_segment = WHEEL_RESULTS[(i - 1 + NUM_PEGS) % NUM_PEGS]
-            right_segment = WHEEL_RESULTS[i]
-            
-            # Default peg color is metallic grey
-            peg_color_dark = COLOR_DARK_GREY
-            peg_color_light = COLOR_LIGHT_GREY
-
-            # If adjacent to a "House Win" segment, color the peg black.
-            if left_segment == (0,0,0) or right_segment == (0,0,0):
-                peg_color_dark = COLOR_PEG_BLACK_DARK
-                peg_color_light = COLOR_PEG_BLACK_LIGHT
-            # If adjacent to a "Spin Again" segment, color the peg green.
-            elif left_segment == (9,9,9) or right_segment == (9,9,9):
-                peg_color_dark = COLOR_PEG_GREEN_DARK
-                peg_color_light = COLOR_PEG_GREEN_LIGHT
-            
-            th = math.radians(i*angle_step)
-            px = wheel_center[0] + peg_ring*math.cos(th)
-            py = wheel_center[1] + peg_ring*math.sin(th)
+        highlight_offset = int(2*scale_factor)
+        for (ux, uy), (peg_color_dark, peg_color_light) in zip(spokes, PEG_COLORS):
+            px = wheel_center[0] + peg_ring*ux
+            py = wheel_center[1] + peg_ring*uy
             pygame.draw.circle(wheel_surf, peg_color_dark, (px,py), peg_radius)
             pygame.draw.circle(wheel_surf, peg_color_light, (px,py), peg_radius - int(2*scale_factor))
-            pygame.draw.circle(wheel_surf, COLOR_WHITE,      (px-int(2*scale_factor), py-int(2*scale_factor)), max(1, peg_radius - int(5*scale_factor)))
+            pygame.draw.circle(wheel_surf, COLOR_WHITE,      (px-highlight_offset, py-highlight_offset), max(1, peg_radius - int(5*scale_factor)))
 
         # ===== CENTERPIECE =====
         # 8. The high-detail two-layer star
@@ -791,8 +969,10 @@ class Game:
         self.wheel_radius = max_dim // 2
 
         print("Generating dynamic wheel surface...")
-        self.wheel_img = self.create_wheel_surface() # This is the key change from loading a PNG
+        # A wheel loaded from the texture cache comes back in PNG byte order; match the display so blits take SDL's fast path.
+        self.wheel_img = self.create_wheel_surface().convert_alpha()
         print("Wheel surface created.")
+        self.rotation_cache = OrderedDict() # Snapped angle step -> rotated wheel surface
 
         self.logo_img = None
         if os.path.exists(LOGO_IMAGE_PATH):
@@ -800,6 +980,9 @@ class Game:
             logo_h = 450
             logo_w = int(logo_raw.get_width() * (logo_h / logo_raw.get_height()))
             self.logo_img = pygame.transform.smoothscale(logo_raw, (logo_w, logo_h))
+            # A fully opaque logo doesn't need per-pixel alpha, and blits much faster without it.
+            if pygame.mask.from_surface(self.logo_img, 254).count() == logo_w * logo_h:
+                self.logo_img = self.logo_img.convert()
 
         self.click_sound = None
         if CLICK_SOUND and os.path.exists(CLICK_SOUND):
@@ -824,6 +1007,7 @@ class Game:
         self.result_title_surf   = self.result_title_font.render("Winning Number", True, (255, 255, 255))
         self.stats_title_surf    = self.title_font.render("Full Statistics", True, (0, 200, 0))
         self.return_surf         = self.stats_screen_title_font.render("Press 'S' to return to the game", True, (255, 255, 0))
+        self.test_mode_surf      = self.title_font.render("--- TEST MODE ---", True, (255, 255, 0))
 
     def run(self):
         print("Ready. Press SPACE to spin or use the wireless button.")
@@ -831,25 +1015,29 @@ class Game:
         running = True
         while running:
             running = self._handle_events()      # Process user input
+            self._service_mqtt()                 # Process button messages on this thread
             self._update_state(dt)               # Update game logic and animation
             self._draw()                         # Render the current frame
             dt = self.clock.tick(FPS) / 1000.0   # Control frame rate
         # --- Shutdown ---
-        if self.mqtt_client and self.mqtt_client.is_connected():
-            self.mqtt_client.loop_stop()
+        if self.mqtt_connected:
+            self.mqtt_client.disconnect()
         pygame.quit()
         sys.exit(0)
 
     def _handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT: return False
+            if event.type == pygame.VIDEOEXPOSE: self.stats_screen_dirty = self.game_screen_dirty = True
             if event.type == pygame.KEYDOWN:
                 if event.key in (pygame.K_ESCAPE, pygame.K_q): return False
-                if event.key == pygame.K_s: self.current_screen = "stats" if self.current_screen == "game" else "game"
+                if event.key == pygame.K_s:
+                    self.current_screen = "stats" if self.current_screen == "game" else "game"
+                    self.stats_screen_dirty = self.game_screen_dirty = True
                 if self.current_screen == "game":
                     is_animating = self.animation_state != "idle"
                     if event.key == pygame.K_p and not is_animating: self._run_silent_simulation(45)
-                    if event.key == pygame.K_t: self.test_mode = not self.test_mode; self.result_display_text = ""; self.winning_segment_index = None
+                    if event.key == pygame.K_t: self.test_mode = not self.test_mode; self.result_display_text = ""; self.winning_segment_index = None; self.game_screen_dirty = True
                     if event.key == pygame.K_SPACE and not is_animating and not self.test_mode: self._start_spin()
                     if self.test_mode:
                         if event.key == pygame.K_RIGHT: self.test_index = (self.test_index + 1) % NUM_PEGS
@@ -858,7 +1046,9 @@ class Game:
 
     def _update_state(self, dt):
         if self.current_screen != "game": return
-        self.flash_timer += 1
+        self.flash_timer += dt
+        if self.result_display_text:
+            self.rainbow_hue = (self.rainbow_hue + RAINBOW_SPEED_DEG_PER_SEC * dt) % 360
 
         # --- Update Pointer Animation ---
         if self.pointer_anim_progress < 1.0:
@@ -876,18 +1066,20 @@ class Game:
             self.current_angle = self.rest_angle
 
         # --- Trigger Pointer Animation & Sound ---
-        if self.click_sound and self.animation_state != "idle":
-            # The pointer is at the TOP (270 degrees in Pygame's angle system, where 0 is right).
-            # The wheel's visual rotation is CLOCKWISE for a positive angle.
-            # So the original segment angle `A` now under the pointer is `270 - current_angle`.
-            pointer_angle = 270 
-            normalized_angle = self.current_angle % 360
-            angle_under_pointer = (pointer_angle - normalized_angle + 360) % 360
-            idx_now = int(angle_under_pointer / self.seg_angle)
-            if idx_now != self.last_tick_idx:
-                self.click_channel.play(self.click_sound)
-                self.last_tick_idx = idx_now
-                self.pointer_anim_progress = 0.0 # Reset animation on each tick
+        if not self.click_sound or self.animation_state == "idle": return
+        idx_now = self._segment_under_pointer(self.current_angle)
+        if idx_now != self.last_tick_idx:
+            self.click_channel.play(self.click_sound)
+            self.last_tick_idx = idx_now
+            self.pointer_anim_progress = 0.0 # Reset animation on each tick
+
+    def _segment_under_pointer(self, angle):
+        """Returns the index of the segment under the pointer when the wheel is rotated by `angle` degrees."""
+        # The pointer is at the TOP (270 degrees in Pygame's angle system, where 0 is right).
+        # The wheel's visual rotation is CLOCKWISE for a positive angle.
+        # So the original segment angle `A` now under the pointer is `270 - angle`.
+        # Flooring that into whole segments and wrapping the index replaces normalizing the angle first.
+        return math.floor((270 - angle) * self.segs_per_degree) % NUM_PEGS
 
     def _update_test_mode(self):
         """Locks the wheel to the selected test position and updates the result text."""
@@ -901,11 +1093,8 @@ class Game:
         final_angle = 270 - target_segment_angle
         
         self.current_angle = self.rest_angle = final_angle
-        result = WHEEL_RESULTS[self.test_index]
         self.winning_segment_index = self.test_index # Set winner for highlighting
-        if result == (0,0,0): self.result_display_text = "House Wins"
-        elif result == (9,9,9): self.result_display_text = "Spin Again"
-        else: self.result_display_text = f"{result[0]} - {result[1]} - {result[2]}"
+        self.result_display_text = SEGMENT_LABELS[self.test_index]
 
     def _update_wind_up(self, dt):
         """Handles the backward wind-up animation."""
@@ -918,16 +1107,28 @@ class Game:
 
     def _draw(self):
         """Main drawing function; calls the renderer for the current screen."""
-        self.screen.fill((20,20,20))
-        if self.current_screen == "game": self._draw_game_screen()
-        elif self.current_screen == "stats": self._draw_stats_screen()
+        if self.current_screen == "game":
+            animating = self._game_screen_animating()
+            if not (animating or self.game_screen_dirty): return # Nothing has moved since the last presented frame
+            self._draw_game_screen() # The static background covers the whole screen
+            self.game_screen_dirty = animating # Draw once more after the animation settles, to show its final state
+        elif self.current_screen == "stats":
+            if not self.stats_screen_dirty: return # The last presented frame is still up to date
+            self._draw_stats_screen() # The static background covers the whole screen
+            self.stats_screen_dirty = False
         pygame.display.flip()
 
-    def _draw_winning_segment_highlight(self):
-        """Draws a pulsing highlight over the winning segment of the wheel."""
-        if self.winning_segment_index is None or self.animation_state != "idle":
-            return
+    def _game_screen_animating(self):
+        """Returns True while anything on the game screen changes from frame to frame."""
+        # A shown result brings the rainbow text, the blinking title and the pulsing highlight.
+        return (self.animation_state != "idle" or self.pointer_anim_progress < 1.0
+                or bool(self.result_display_text) or self.winning_segment_index is not None)
 
+    def _create_highlight_surface(self):
+        """
+        Draws the winning-segment highlight arc once, at full opacity, on a surface covering the wheel.
+        The winner always comes to rest under the pointer, so the arc never moves; only its alpha pulses.
+        """
         # --- BUG FIX ---
         # The winning segment is always at the top. In Pygame's coordinate system,
         # where 0 degrees is to the right and angles increase clockwise, the top
@@ -943,175 +1144,252 @@ class Game:
         start_rad = math.radians(start_angle_deg)
         end_rad   = math.radians(end_angle_deg)
 
-        highlight_surf = pygame.Surface(self.WINDOW_SIZE, pygame.SRCALPHA)
+        highlight_surf = pygame.Surface((self.wheel_radius*2, self.wheel_radius*2), pygame.SRCALPHA)
         arc_width = int(self.wheel_radius * 0.35)
-        bounding_rect = pygame.Rect(self.cx - self.wheel_radius, self.cy - self.wheel_radius, self.wheel_radius*2, self.wheel_radius*2)
-
-        pulse = (math.sin(self.flash_timer * 0.1) + 1) / 2
-        alpha = 50 + (pulse * 100)
-        highlight_color = (*COLOR_GOLD, alpha)
+        bounding_rect = highlight_surf.get_rect()
 
         # Pygame draws the arc from start_rad to end_rad COUNTER-CLOCKWISE.
         # Since our angles are set up correctly, this will draw the arc at the top.
-        pygame.draw.arc(highlight_surf, highlight_color, bounding_rect, start_rad, end_rad, arc_width)
-        self.screen.blit(highlight_surf, (0,0))
+        pygame.draw.arc(highlight_surf, (*COLOR_GOLD, 255), bounding_rect, start_rad, end_rad, arc_width)
+        return highlight_surf
 
-
-    def _draw_game_screen(self):
-        """Renders all elements for the main game screen."""
-        self.screen.blit(self.title_text_surf, (30, 20))
+    def _draw_winning_segment_highlight(self):
+        """Draws a pulsing highlight over the winning segment of the wheel."""
+        if self.winning_segment_index is None or self.animation_state != "idle":
+            return
+        pulse = (math.sin(self.flash_timer * HIGHLIGHT_PULSE_SPEED) + 1) / 2
+        self.highlight_surf.set_alpha(int(50 + (pulse * 100))) # Scales the arc's full-opacity pixels
+        self.screen.blit(self.highlight_surf, (self.cx - self.wheel_radius, self.cy - self.wheel_radius))
+
+
+    def _get_rotated_wheel(self):
+        """Returns the wheel image rotated to the current angle, reusing recently rotated copies."""
+        step = round(self.current_angle / ROTATION_CACHE_STEP_DEG) % round(360 / ROTATION_CACHE_STEP_DEG)
+        smooth = self.animation_state == "idle"
+        key = (step, smooth)
+        rotated = self.rotation_cache.get(key)
+        if rotated is not None:
+            self.rotation_cache.move_to_end(key)
+            return rotated
+        # Both transforms rotate CCW, so a negative angle produces a CW visual rotation.
+        if smooth:
+            rotated = pygame.transform.rotozoom(self.wheel_img, -step * ROTATION_CACHE_STEP_DEG, 1.0)
+        else:
+            # While moving, plain `rotate` skips rotozoom's smoothing pass; the motion hides the aliasing.
+            rotated = pygame.transform.rotate(self.wheel_img, -step * ROTATION_CACHE_STEP_DEG)
+        self.rotation_cache[key] = rotated
+        if len(self.rotation_cache) > ROTATION_CACHE_SIZE:
+            self.rotation_cache.popitem(last=False) # Drop the least recently used copy
+        return rotated
+
+    def _get_result_surf(self):
+        """Returns the result text in the current rainbow color, rendering each hue step once per result."""
+        if self.result_surf_text != self.result_display_text:
+            self.result_surf_text = self.result_display_text
+            self.result_surf_cache = {}
+        step = int(self.rainbow_hue // RAINBOW_HUE_STEP_DEG)
+        surf = self.result_surf_cache.get(step)
+        if surf is None:
+            surf = self.result_font.render(self.result_display_text, True, RAINBOW_COLORS[step * RAINBOW_HUE_STEP_DEG])
+            self.result_surf_cache[step] = surf
+        return surf
+
+    def _create_game_background(self):
+        """Pre-composes everything on the game screen that never changes into one opaque surface."""
+        bg = pygame.Surface(self.WINDOW_SIZE).convert()
+        bg.fill((20,20,20))
+        bg.blit(self.title_text_surf, (30, 20))
         logo_y = 20 + self.title_text_surf.get_height() + 10
-        if self.logo_img: self.screen.blit(self.logo_img, (30, logo_y))
+        if self.logo_img: bg.blit(self.logo_img, (30, logo_y))
         if self.payout_table_surf:
             table_rect = self.payout_table_surf.get_rect(bottomright=(self.WINDOW_SIZE[0]-30, self.WINDOW_SIZE[1]-20))
-            self.screen.blit(self.payout_table_surf, table_rect)
+            bg.blit(self.payout_table_surf, table_rect)
+        # The ring sits outside the wheel's radius, so the wheel (drawn later) never covers it.
+        pygame.draw.circle(bg, COLOR_BLACK, (self.cx, self.cy), self.wheel_radius + 20, width=6)
+        return bg
+
+    def _create_stats_background(self):
+        """Pre-composes the fixed parts of the stats screen into one opaque surface."""
+        bg = pygame.Surface(self.WINDOW_SIZE).convert()
+        bg.fill((20,20,20))
+        bg.blit(self.stats_title_surf, (50, 20))
+        bg.blit(self.return_surf, self.return_surf.get_rect(centerx=self.cx, bottom=self.WINDOW_SIZE[1]-30))
+        return bg
 
-        # Draw the rotated wheel. `rotozoom` rotates CCW, so a negative angle produces a CW visual rotation.
-        rotated = pygame.transform.rotozoom(self.wheel_img, -self.current_angle, 1.0)
-        blit_center(self.screen, rotated, (self.cx, self.cy))
+    def _draw_game_screen(self):
+        """Renders all elements for the main game screen."""
+        screen = self.screen; blit = screen.blit
+        win_w, win_h = self.WINDOW_SIZE
+        blit(self.game_background, (0, 0))
+
+        blit_center(screen, self._get_rotated_wheel(), (self.cx, self.cy))
 
         self._draw_winning_segment_highlight()
 
-        pygame.draw.circle(self.screen, COLOR_BLACK, (self.cx, self.cy), self.wheel_radius + 20, width=6)
-        draw_animated_pointer(self.screen, self.cx, self.cy, self.wheel_radius, self.pointer_anim_progress)
+        draw_animated_pointer(screen, self.pointer_surf, self.cx, self.cy, self.wheel_radius, self.pointer_anim_progress)
 
-        history_title_rect = self.history_title_surf_5.get_rect(topright=(self.WINDOW_SIZE[0]-50, 60))
-        self.screen.blit(self.history_title_surf_5, history_title_rect)
+        # The history title can overlap the wheel's edge on narrow screens, so it is drawn on top of it.
+        history_title_rect = self.history_title_surf_5.get_rect(topright=(win_w-50, 60))
+        blit(self.history_title_surf_5, history_title_rect)
         y = history_title_rect.bottom + 10
-        start_color = pygame.Vector3(255,255,255); end_color = pygame.Vector3(139,0,0)
-        short_history = self.results_history_full[:5]
-        for i, s in enumerate(short_history):
-            t = i/4.0 if len(short_history)>1 else 0
-            color = start_color.lerp(end_color, t)
-            surf = self.history_font.render(f"{i+1}.  {s}", True, color)
-            self.screen.blit(surf, surf.get_rect(topright=(self.WINDOW_SIZE[0]-50, y)))
-            y += surf.get_height()
+        if self.last_5_history_surf:
+            blit(self.last_5_history_surf, self.last_5_history_surf.get_rect(topright=(win_w-50, y)))
+            y += self.last_5_history_surf.get_height()
         if self.last_5_stats_surf:
-            self.screen.blit(self.last_5_stats_surf, self.last_5_stats_surf.get_rect(topright=(self.WINDOW_SIZE[0]-50, y+20)))
-
-        if self.result_display_text:
-            self.rainbow_hue = (self.rainbow_hue + 1) % 360
-            rainbow = pygame.Color(0,0,0); rainbow.hsva = (self.rainbow_hue, 100, 100, 100)
-            result_surf = self.result_font.render(self.result_display_text, True, rainbow)
-            result_rect = result_surf.get_rect(bottomleft=(30, self.WINDOW_SIZE[1]-20))
-            self.screen.blit(result_surf, result_rect)
-            if (self.flash_timer // 30) % 2 == 0 and not self.test_mode:
+            blit(self.last_5_stats_surf, self.last_5_stats_surf.get_rect(topright=(win_w-50, y+20)))
+
+        result_text = self.result_display_text
+        if result_text:
+            result_surf = self._get_result_surf()
+            result_rect = result_surf.get_rect(bottomleft=(30, win_h-20))
+            blit(result_surf, result_rect)
+            if int(self.flash_timer / RESULT_TITLE_BLINK_SEC) % 2 == 0 and not self.test_mode:
                 title_rect = self.result_title_surf.get_rect(bottomleft=result_rect.topleft)
-                self.screen.blit(self.result_title_surf, title_rect)
+                blit(self.result_title_surf, title_rect)
 
         if self.test_mode:
-            test_mode_surf = self.title_font.render("--- TEST MODE ---", True, (255,255,0))
-            self.screen.blit(test_mode_surf, test_mode_surf.get_rect(midbottom=(self.cx, self.WINDOW_SIZE[1]-20)))
-            if self.result_display_text:
-                pos_surf = self.debug_font.render(f"Position: {self.test_index}", True, (255,255,0))
-                result_rect = self.result_font.render(self.result_display_text, True, (0,0,0)).get_rect(bottomleft=(30, self.WINDOW_SIZE[1]-20))
+            blit(self.test_mode_surf, self.test_mode_surf.get_rect(midbottom=(self.cx, win_h-20)))
+            if result_text:
+                if self.test_pos_index != self.test_index:
+                    self.test_pos_surf = self.debug_font.render(f"Position: {self.test_index}", True, (255,255,0))
+                    self.test_pos_index = self.test_index
+                pos_surf = self.test_pos_surf
+                result_w, result_h = self.result_font.size(result_text) # Measures without rendering
+                result_rect = pygame.Rect(30, win_h-20-result_h, result_w, result_h)
                 pos_rect = pos_surf.get_rect(bottomleft=result_rect.topleft)
-                self.screen.blit(pos_surf, pos_rect)
+                blit(pos_surf, pos_rect)
 
     def _draw_stats_screen(self):
         """Renders the full statistics screen."""
-        self.screen.blit(self.stats_title_surf, (50, 20))
-        full_stats_surf = create_full_stats_table_surface("All-Time Stats", self.spin_counts_full, self.total_dice_rolled_full, self.total_spins_full, self.combo_counts_full)
-        self.screen.blit(full_stats_surf, (50, 120))
+        blit = self.screen.blit
+        blit(self.stats_background, (0, 0))
+        if self.full_stats_surf is None:
+            self.full_stats_surf = create_full_stats_table_surface("All-Time Stats", self.dice_counts_full, self.house_wins_full, self.spin_again_full, self.total_dice_rolled_full, self.total_spins_full, (self.singles_full, self.doubles_full, self.triples_full))
+            self.total_spins_surf = self.total_spins_font.render(f"Total Spins: {self.total_spins_full}", True, (255,255,255))
+        full_stats_surf = self.full_stats_surf
+        blit(full_stats_surf, (50, 120))
         history_title_rect = self.history_title_surf_45.get_rect(left=full_stats_surf.get_width()+300, top=40)
-        self.screen.blit(self.history_title_surf_45, history_title_rect)
-        col_w, per_col = 350, 15
-        start_color = pygame.Vector3(255,255,255); end_color = pygame.Vector3(139,0,0)
-        for i, s in enumerate(self.results_history_full):
-            col, row = i // per_col, i % per_col
-            if col > 2: continue
-            t = i / (44.0 if len(self.results_history_full)>1 else 1)
-            color = start_color.lerp(end_color, t)
-            surf = self.history_font.render(f"{i+1}.  {s}", True, color)
-            x = history_title_rect.left + (col * col_w)
-            y = history_title_rect.bottom + 10 + (row * surf.get_height())
-            self.screen.blit(surf, (x, y))
-        self.screen.blit(self.return_surf, self.return_surf.get_rect(centerx=self.cx, bottom=self.WINDOW_SIZE[1]-30))
-        total_spins_surf = self.total_spins_font.render(f"Total Spins: {self.total_spins_full}", True, (255,255,255))
-        self.screen.blit(total_spins_surf, (50, self.WINDOW_SIZE[1]-80))
+        blit(self.history_title_surf_45, history_title_rect)
+        if self.history_rows is None:
+            col_w, per_col = 350, 15
+            x0, y0 = history_title_rect.left, history_title_rect.bottom + 10
+            render = self.history_font.render
+            self.history_rows = rows = []
+            for i, (_, text) in enumerate(self.results_history_full):
+                col, row = divmod(i, per_col)
+                if col > 2: break
+                surf = render(f"{i+1}.  {text}", True, HISTORY_COLORS_45[i])
+                rows.append((surf, (x0 + col * col_w, y0 + row * surf.get_height())))
+        self.screen.blits(self.history_rows, doreturn=False) # Up to 45 rows in one call
+        blit(self.total_spins_surf, (50, self.WINDOW_SIZE[1]-80))
 
     def _pick_target(self):
         """Selects a random target segment and calculates the final resting angle for the spin."""
         self.result_display_text = ""
         # k is the index of the winning segment
-        k = random.randrange(NUM_PEGS)
-        # The angle for the center of that segment.
-        target_segment_angle = (k + 0.5) * self.seg_angle
-        spins = random.randint(MIN_SPINS, MAX_SPINS)
-        
-        # The final resting angle must place the `target_segment_angle` at the top pointer (270 degrees).
-        # So, the final rotation angle is `270 - target_segment_angle`.
-        final_destination = 270 - target_segment_angle
-        
+        rng = self.rng
+        k = rng.randrange(NUM_PEGS)
+        spins = rng.randint(MIN_SPINS, MAX_SPINS)
+        # The final resting angle must place the center of segment k at the top pointer.
+        final_destination = self.segment_rest_angles[k]
         start_angle = self.rest_angle - WIND_UP_ANGLE_DEG
-        # Calculate total rotation needed to get from wind-up start to the final destination over several spins
-        total_rotation = (spins * 360) + ((final_destination - (start_angle % 360) + 360) % 360)
-        self.final_angle_base = start_angle + total_rotation
+        # Total rotation needed to get from wind-up start to the final destination over several spins
+        self.final_angle_base = start_angle + spins * 360 + (final_destination - start_angle) % 360
         self.last_tick_idx = None
 
-    def _process_spin_result(self, winning_result):
-        """Updates all statistics based on a spin result and returns a display string."""
-        self.total_spins_full += 1
-        uniq = len(set(winning_result))
-        if uniq == 1 and winning_result not in [(0,0,0),(9,9,9)]: self.combo_counts_full['Triples'] += 1
-        elif uniq == 2: self.combo_counts_full['Doubles'] += 1
-        else: self.combo_counts_full['Singles'] += 1
-        if winning_result == (0,0,0):
-            self.spin_counts_full['House Wins'] += 1; return "House Wins"
-        elif winning_result == (9,9,9):
-            self.spin_counts_full['Spin Again'] += 1; return "Spin Again"
+    def _process_spin_result(self, idx, count=1):
+        """Updates all statistics for `count` spins landing on segment `idx` and returns its display string."""
+        winning_result = WHEEL_RESULTS[idx]
+        (singles, doubles, triples), face_hits, dice_rolled = SEGMENT_TALLIES[idx]
+        self.total_spins_full += count
+        self.singles_full += singles * count
+        self.doubles_full += doubles * count
+        self.triples_full += triples * count
+        if winning_result == RESULT_HOUSE_WINS:
+            self.house_wins_full += count
+        elif winning_result == RESULT_SPIN_AGAIN:
+            self.spin_again_full += count
         else:
-            for d in winning_result:
-                if 1 <= d <= 6: self.spin_counts_full[d] += 1; self.total_dice_rolled_full += 1
-            return f"{winning_result[0]} - {winning_result[1]} - {winning_result[2]}"
+            for face, hits in face_hits: self.dice_counts_full[face] += hits * count
+            self.total_dice_rolled_full += dice_rolled * count
+        return SEGMENT_LABELS[idx]
 
     def _run_silent_simulation(self, num_spins):
         """Performs instant spins to populate statistics without animation."""
         print(f"--- Running silent simulation of {num_spins} spins ---")
-        for _ in range(num_spins):
-            wr = random.choice(WHEEL_RESULTS)
-            txt = self._process_spin_result(wr)
-            self.results_history_full.insert(0, txt)
-        if len(self.results_history_full) > 45: self.results_history_full = self.results_history_full[:45]
+        picks = self.rng.choices(range(NUM_PEGS), k=num_spins)
+        # Tally each distinct segment once, weighted by how many times it came up.
+        for idx, count in Counter(picks).items(): self._process_spin_result(idx, count)
+        # Only the newest 45 results can end up in the history, so skip the rest.
+        for idx in picks[-45:]:
+            self.results_history_full.appendleft((WHEEL_RESULTS[idx], SEGMENT_LABELS[idx]))
         self._update_on_screen_stats()
         print("--- Simulation complete ---")
 
     def _update_on_screen_stats(self):
-        """Calculates stats for the most recent 5 results and renders them to a surface."""
-        short = self.results_history_full[:5]
-        if not short: self.last_5_stats_surf = None; return
-        spin_counts = {i:0 for i in range(1,7)}; spin_counts.update({'House Wins':0, 'Spin Again':0})
+        """Calculates stats for the most recent 5 results and renders them and the result list to surfaces."""
+        self.history_rows = self.full_stats_surf = self.total_spins_surf = None
+        self.stats_screen_dirty = self.game_screen_dirty = True
+        short = list(islice(self.results_history_full, 5))
+        if not short: self.last_5_stats_surf = self.last_5_history_surf = None; return
+        self.last_5_history_surf = create_history_list_surface(self.history_font, [text for _, text in short])
+        dice_counts = [0]*7; house_wins = spin_again = 0
         total_dice = 0
-        for s in short:
-            if s == "House Wins": spin_counts['House Wins'] += 1
-            elif s == "Spin Again": spin_counts['Spin Again'] += 1
+        for result, _ in short:
+            if result == RESULT_HOUSE_WINS: house_wins += 1
+            elif result == RESULT_SPIN_AGAIN: spin_again += 1
             else:
-                try:
-                    dice = [int(d.strip()) for d in s.split("-")];
-                    for d in dice:
-                        if 1 <= d <= 6: spin_counts[d] += 1; total_dice += 1
-                except (ValueError, IndexError): pass
-        self.last_5_stats_surf = create_main_screen_stats_table("Last 5 Stats", spin_counts, total_dice, len(short))
+                for d in result: dice_counts[d] += 1
+                total_dice += 3
+        self.last_5_stats_surf = create_main_screen_stats_table("Last 5 Stats", dice_counts, house_wins, spin_again, total_dice, len(short))
 
     def _setup_mqtt(self):
         """Sets up the MQTT client, defines callbacks, and connects to the broker."""
         self.mqtt_client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
         self.mqtt_client.on_connect = self._on_mqtt_connect
         self.mqtt_client.on_message = self._on_mqtt_message
+        self.mqtt_client.on_disconnect = self._on_mqtt_disconnect
+        self.mqtt_active = False # Set once the broker has been reached; _service_mqtt then runs the client
+        self.mqtt_connected = False # Tracked by the connect/disconnect callbacks, which run on the game thread
+        self.mqtt_retry_time = 0.0
         try:
             self.mqtt_client.connect("localhost", 1883, 60)
-            self.mqtt_client.loop_start() # Starts a background thread for MQTT
+            self.mqtt_active = True
         except Exception as e:
             print(f"\n--- MQTT CONNECTION FAILED: {e} --- \nCould not connect to MQTT broker. You can still use keyboard controls.\n")
 
+    def _service_mqtt(self):
+        """
+        Runs one non-blocking pass of the MQTT network loop, once per frame.
+        Doing this on the game thread (instead of paho's loop_start() thread) avoids
+        a second Python thread competing for the GIL with the renderer, and means
+        message callbacks never change game state in the middle of a frame.
+        """
+        if not self.mqtt_active: return
+        rc = self.mqtt_client.loop(timeout=0.0)
+        if rc in (mqtt.MQTT_ERR_NO_CONN, mqtt.MQTT_ERR_CONN_LOST):
+            now = pygame.time.get_ticks() / 1000.0
+            if now < self.mqtt_retry_time: return
+            self.mqtt_retry_time = now + MQTT_RECONNECT_DELAY_SEC
+            try:
+                self.mqtt_client.reconnect()
+                print("Reconnected to MQTT Broker.")
+            except Exception as e:
+                print(f"MQTT reconnect failed: {e}")
+
     def _on_mqtt_connect(self, client, userdata, flags, rc, properties):
         """Callback executed on successful connection to the MQTT broker."""
         if rc == 0:
             print("Connected to MQTT Broker successfully.")
+            self.mqtt_connected = True
             client.subscribe("wheel/spin") # Subscribe to the button's topic
         else:
             print(f"Failed to connect to MQTT Broker, return code {rc}\n")
 
+    def _on_mqtt_disconnect(self, client, userdata, flags, rc, properties):
+        """Callback executed when the connection to the MQTT broker closes or is lost."""
+        self.mqtt_connected = False
+
     def _on_mqtt_message(self, client, userdata, msg):
         """Callback executed when a message is received from the MQTT broker."""
         if msg.topic == "wheel/spin" and msg.payload.decode() == "pressed":
@@ -1120,7 +1398,7 @@ class Game:
 
     def _publish_state(self, state):
         """Publishes the current wheel state (e.g., 'spinning') for the button to react to."""
-        if self.mqtt_client and self.mqtt_client.is_connected():
+        if self.mqtt_connected:
             self.mqtt_client.publish("wheel/state", payload=state, qos=0, retain=False)
             print(f"Published state: {state}")
 
@@ -1130,47 +1408,41 @@ class Game:
         self.winning_segment_index = None # Clear previous winner's highlight
         self.animation_state = "winding_up"
         self.animation_progress = 0.0
-        self.current_spin_duration = random.uniform(MIN_SPIN_TIME_SEC, MAX_SPIN_TIME_SEC)
+        self.current_spin_duration = self.rng.uniform(MIN_SPIN_TIME_SEC, MAX_SPIN_TIME_SEC)
         self._pick_target()
+        self.spin_start_angle = self.rest_angle - WIND_UP_ANGLE_DEG
+        self.spin_rotation = self.final_angle_base - self.spin_start_angle
         self._publish_state("spinning")
 
     def _update_spin(self, dt):
         """Handles the main forward spin animation, including the final wobble."""
         self.animation_progress += dt / self.current_spin_duration
         u = min(1.0, self.animation_progress)
-        eased_u = ease_out_cubic(u)
-        wobble = end_wobble(u)
-        spin_start = self.rest_angle - WIND_UP_ANGLE_DEG
-        base_angle = spin_start + (self.final_angle_base - spin_start) * eased_u
-        self.current_angle = base_angle + wobble
+        # Cubic ease-out (starts fast, slows down to a stop), inlined; the wobble is only evaluated during the settle phase.
+        y = 1.0 - u
+        eased_u = 1.0 - y * y * y
+        wobble = end_wobble(u) if u >= SETTLE_WOBBLE_START else 0.0
+        self.current_angle = self.spin_start_angle + self.spin_rotation * eased_u + wobble
         if u >= 1.0: # Spin has finished
             self.animation_state = "idle"
-            self.rest_angle = self.final_angle_base
+            # Wrap the resting angle back into [0, 360) so it doesn't grow by several turns every spin.
+            self.rest_angle = self.final_angle_base % 360
+            self.current_angle = self.rest_angle
             
             # Determine the winning segment index based on the final resting angle.
-            # The original angle `A` of the segment that has landed under the pointer (270 deg) is
-            # found by reversing the rotation: `A = 270 - final_rotation`.
-            pointer_angle = 270
-            normalized = self.rest_angle % 360
-            
-            # The angle on the original, un-rotated wheel that is now under the pointer.
-            under_pointer_angle = (pointer_angle - normalized + 360) % 360
-            
-            idx = int(under_pointer_angle / self.seg_angle)
+            idx = self._segment_under_pointer(self.rest_angle)
             self.winning_segment_index = idx # Store winner for highlighting
             winning_result = WHEEL_RESULTS[idx]
 
             # Process and display the result
-            self.result_display_text = self._process_spin_result(winning_result)
-            self.results_history_full.insert(0, self.result_display_text)
-            if len(self.results_history_full) > 45:
-                self.results_history_full = self.results_history_full[:45]
+            self.result_display_text = self._process_spin_result(idx)
+            self.results_history_full.appendleft((winning_result, self.result_display_text))
             self._update_on_screen_stats()
             
             # Send specific state message to the button based on the outcome.
-            if winning_result == (0, 0, 0):
+            if winning_result == RESULT_HOUSE_WINS:
                 self._publish_state("flash_red")
-            elif winning_result == (9, 9, 9):
+            elif winning_result == RESULT_SPIN_AGAIN:
                 self._publish_state("flash_green")
             else:
                 self._publish_state("flash_white")
@@ -5,10 +5,14 @@ from machine import Pin
 from umqtt.simple import MQTTClient
 from neopixel import NeoPixel
 import math
+import micropython
+from micropython import const
 
 # =============================================================================
 # --- CONFIGURATION (EDIT THESE VALUES) ---
 # =============================================================================
+# Whole-number settings are wrapped in const() so MicroPython can build them straight into
+# the compiled code instead of looking them up every loop; just edit the number inside.
 # Your Wi-Fi network name (SSID) and password
 WIFI_SSID = "game"
 WIFI_PASS = "1234567890"
@@ -22,35 +26,35 @@ MQTT_CLIENT_ID = "pico_wheel_button"
 
 # How often (in milliseconds) to send a "ping" to the MQTT broker.
 # This acts as a heartbeat to keep the connection from being closed due to inactivity.
-MQTT_PING_INTERVAL_MS = 500
+MQTT_PING_INTERVAL_MS = const(500)
 
 # --- LED ANIMATION CONFIGURATION ---
 # Set to True to enable a smooth pulsing "breathing" effect for the idle state.
 # Set to False for a simple, solid green light.
 IDLE_BREATHING_EFFECT = True
-IDLE_BREATHE_SPEED_MS = 20         # Speed of the breathing effect (lower is faster).
-IDLE_BREATHE_MIN_BRIGHTNESS = 30   # The dimmest the LED will get (0-255).
-IDLE_BREATHE_MAX_BRIGHTNESS = 200  # The brightest the LED will get (0-255).
+IDLE_BREATHE_SPEED_MS = const(20)         # Speed of the breathing effect (lower is faster).
+IDLE_BREATHE_MIN_BRIGHTNESS = const(30)   # The dimmest the LED will get (0-255).
+IDLE_BREATHE_MAX_BRIGHTNESS = const(200)  # The brightest the LED will get (0-255).
 
 # The animation style to use when the wheel is in the "spinning" state.
 # Options: 'chasing_rainbow', 'cycling_color'
 SPIN_ANIMATION_MODE = 'cycling_color'
-CHASING_RAINBOW_SPEED_MS = 1 # Delay between steps for the rainbow chase (lower is faster).
-CYCLING_COLOR_SPEED_MS = 5   # Delay between color changes for the solid cycle (lower is faster).
+CHASING_RAINBOW_SPEED_MS = const(1) # Delay between steps for the rainbow chase (lower is faster).
+CYCLING_COLOR_SPEED_MS = const(5)   # Delay between color changes for the solid cycle (lower is faster).
 
 # --- NEW: FLASH AND FADE CONFIGURATION ---
 # Number of times the LEDs should flash for each result color.
-FLASH_COUNT_WHITE = 13
-FLASH_COUNT_RED = 13
-FLASH_COUNT_GREEN = 13
+FLASH_COUNT_WHITE = const(13)
+FLASH_COUNT_RED = const(13)
+FLASH_COUNT_GREEN = const(13)
 
 # Duration in milliseconds for one half of a flash cycle (the fade-in or fade-out).
 # A full flash (in and out) will take twice this duration.
-FLASH_FADE_DURATION_MS = 300
+FLASH_FADE_DURATION_MS = const(300)
 # The duration in milliseconds to wait with the LEDs off after flashing is complete.
-POST_FLASH_DELAY_MS = 2000
+POST_FLASH_DELAY_MS = const(2000)
 # The duration in milliseconds for the final fade from black to the green idle color.
-FADE_TO_GREEN_DURATION_MS = 2000
+FADE_TO_GREEN_DURATION_MS = const(2000)
 # The target color for the 'idle' state, represented as (Red, Green, Blue).
 IDLE_COLOR = (0, 50, 0)
 # =============================================================================
@@ -62,20 +66,52 @@ IDLE_COLOR = (0, 50, 0)
 # Pin.PULL_UP means an internal resistor is used to pull the voltage high, so the button just needs to connect the pin to Ground (GND) when pressed.
 button = Pin(15, Pin.IN, Pin.PULL_UP)
 # Configure the NeoPixel ring.
-NUM_LEDS = 24 # The number of LEDs in the ring.
+NUM_LEDS = const(24) # The number of LEDs in the ring.
 # Initialize the NeoPixel object on GPIO pin 16.
 pixels = NeoPixel(Pin(16), NUM_LEDS)
 
 
+# --- LED STATES ---
+# The states of the LED ring, as small integers so the main loop compares numbers rather than strings.
+# The three flash states must stay consecutive; they are tested as a range.
+STATE_IDLE = const(0)
+STATE_SPINNING = const(1)
+STATE_FLASH_RED = const(2)
+STATE_FLASH_GREEN = const(3)
+STATE_FLASH_WHITE = const(4)
+STATE_POST_FLASH_DELAY = const(5)
+STATE_FADE_TO_GREEN = const(6)
+
+# Maps the messages received on 'wheel/state' to the states above.
+MQTT_STATES = {
+    "idle": STATE_IDLE,
+    "spinning": STATE_SPINNING,
+    "flash_red": STATE_FLASH_RED,
+    "flash_green": STATE_FLASH_GREEN,
+    "flash_white": STATE_FLASH_WHITE,
+    "post_flash_delay": STATE_POST_FLASH_DELAY,
+    "fade_to_green": STATE_FADE_TO_GREEN,
+}
+
+# The color and number of flashes for each of the flash states.
+FLASH_PARAMS = {
+    STATE_FLASH_RED: ((255, 0, 0), FLASH_COUNT_RED),
+    STATE_FLASH_GREEN: ((0, 255, 0), FLASH_COUNT_GREEN),
+    STATE_FLASH_WHITE: ((255, 255, 255), FLASH_COUNT_WHITE),
+}
+
+
 # --- GLOBAL VARIABLES ---
 # These variables hold the state and timing information for the script.
 mqtt_client = None               # Will hold the MQTT client object after connection.
-current_state = "idle"           # The master state of the LED ring (e.g., "idle", "spinning", "flash_red").
-last_button_state = True         # Used to detect a button press (change from not pressed to pressed).
+current_state = STATE_IDLE       # The master state of the LED ring (one of the STATE_* constants).
+button_pressed = False           # Set by the button's interrupt handler when a press (falling edge) is seen.
 debounce_time = 0                # Timestamp used to prevent multiple rapid-fire button presses.
+idle_written = False             # Whether the solid idle color has been written since the state last changed.
+last_written_color = -1          # The solid color last written to the strip, packed as 0xRRGGBB (-1 if the strip isn't a solid color).
 
 # Animation and network timing variables
-last_anim_update = 0             # Timestamp of the last animation frame update.
+next_frame_time = 0              # Timestamp at which the current animation's next frame is due.
 last_ping = 0                    # Timestamp of the last MQTT ping.
 loop_counter = 0                 # A simple counter for periodic debug printing.
 rainbow_step = 0                 # Current position in the rainbow color wheel (0-255).
@@ -91,23 +127,106 @@ fade_to_green_start_time = 0     # Timestamp for when the final fade to green st
 
 
 # --- LED HELPER FUNCTIONS ---
+@micropython.viper
+def fill_rgb(buf: ptr8, r: int, g: int, b: int, n: int):
+    """Fills the first n pixels of a NeoPixel buffer with one color, in its GRB byte order."""
+    # Four GRB pixels are exactly three 32-bit words (GRBG RBGR BGRB, little-endian), so the bulk
+    # of the buffer is written a word at a time. The buffer is a heap bytearray, so it is word-aligned.
+    px = g | (r << 8) | (b << 16)
+    w0 = px | (px << 24)
+    w1 = (px >> 8) | (px << 16)
+    w2 = (px >> 16) | (px << 8)
+    words = ptr32(buf)
+    i = 0
+    end = (n >> 2) * 3
+    while i < end:
+        words[i] = w0
+        words[i + 1] = w1
+        words[i + 2] = w2
+        i += 3
+    # Any pixels left over when n isn't a multiple of four are written byte by byte.
+    i = end * 4
+    end = n * 3
+    while i < end:
+        buf[i] = g
+        buf[i + 1] = r
+        buf[i + 2] = b
+        i += 3
+
+def show_rgb(r, g, b):
+    """Fills all LEDs with the color (r, g, b) and writes it to the strip, without building a tuple or using NeoPixel.fill()."""
+    global last_written_color
+    # The fades and the breathing curve often land on the same color for several frames in a row;
+    # skip the write (roughly 0.7 ms of bit-banging) when the strip already shows it.
+    color = (r << 16) | (g << 8) | b
+    if color == last_written_color:
+        return
+    fill_rgb(pixels.buf, r, g, b, NUM_LEDS)
+    pixels.write()
+    last_written_color = color
+
 def set_pixels(color):
     """Fills all LEDs with a single solid color and writes it to the strip."""
-    pixels.fill(color)
-    pixels.write()
+    show_rgb(color[0], color[1], color[2])
 
-def wheel(pos):
-    """Helper function to generate a color from a position on a 256-step rainbow wheel."""
+@micropython.viper
+def wheel(pos: int) -> int:
+    """Helper function to generate a color from a position on a 256-step rainbow wheel, packed as 0xRRGGBB."""
     # Input a value 0 to 255 to get a color value.
     # The colors are a transition r - g - b - back to r.
+    # Compiled to machine code with integer-only math; packing the result avoids allocating a tuple.
     if pos < 85:
-        return (pos * 3, 255 - pos * 3, 0)
+        return ((pos * 3) << 16) | ((255 - pos * 3) << 8)
     elif pos < 170:
         pos -= 85
-        return (255 - pos * 3, 0, pos * 3)
+        return ((255 - pos * 3) << 16) | (pos * 3)
     else:
         pos -= 170
-        return (0, pos * 3, 255 - pos * 3)
+        return ((pos * 3) << 8) | (255 - pos * 3)
+
+# Where each LED sits on the 256-step rainbow wheel; NUM_LEDS is fixed, so the divides are done once here.
+PIXEL_OFFSETS = bytearray((i * 256) // NUM_LEDS for i in range(NUM_LEDS))
+
+@micropython.viper
+def render_chase(buf: ptr8, step: int):
+    """Writes one frame of the chasing rainbow straight into the NeoPixel buffer, in its GRB byte order."""
+    offsets = ptr8(PIXEL_OFFSETS)
+    words = ptr32(buf)
+    acc = 0    # Bytes waiting to be stored as the next 32-bit word of the buffer.
+    shift = 0  # How many bits of acc are already filled.
+    w = 0      # Index of the next word to store.
+    for i in range(int(NUM_LEDS)):
+        # Same colors as wheel(), inlined so no call or tuple is made per pixel.
+        pos = (offsets[i] + step) & 255
+        if pos < 85:
+            r = pos * 3; g = 255 - r; b = 0
+        elif pos < 170:
+            b = (pos - 85) * 3; r = 255 - b; g = 0
+        else:
+            g = (pos - 170) * 3; b = 255 - g; r = 0
+        # Pack the pixel's GRB bytes and store whole words as they fill up: one store per 4/3 pixels
+        # instead of three byte stores per pixel.
+        px = g | (r << 8) | (b << 16)
+        acc |= px << shift
+        shift += 24
+        if shift >= 32:
+            words[w] = acc
+            w += 1
+            shift -= 32
+            acc = px >> (24 - shift)
+    # Flush any bytes of a final, partial word.
+    i = w * 4
+    while shift > 0:
+        buf[i] = acc & 0xFF
+        acc >>= 8
+        shift -= 8
+        i += 1
+
+# Brightness for each of the 256 steps of the idle breathing cycle, computed once at boot:
+# a sine wave mapped onto the configured min/max brightness range.
+BREATHE_LUT = bytearray(
+    int(IDLE_BREATHE_MIN_BRIGHTNESS + (math.sin(i * (math.pi / 128)) + 1) / 2 * (IDLE_BREATHE_MAX_BRIGHTNESS - IDLE_BREATHE_MIN_BRIGHTNESS))
+    for i in range(256))
 
 # --- NON-BLOCKING ANIMATION HANDLERS ---
 # Each of these functions manages the logic for a specific LED state.
@@ -116,66 +235,62 @@ def wheel(pos):
 
 def handle_idle_leds():
     """Sets the LEDs to a solid green color for the idle state (if not already set)."""
-    if pixels[0] != IDLE_COLOR:
+    global idle_written
+    if not idle_written:
         set_pixels(IDLE_COLOR)
+        idle_written = True
+
+# The timed animations below are only called once next_frame_time has passed, and each one
+# schedules its next frame more than its configured delay ahead to control the speed.
 
 def handle_breathing_idle_leds():
     """Creates a smooth, pulsing "breathing" effect for the idle state."""
-    global rainbow_step, last_anim_update
-    now = time.ticks_ms()
-    # Only update the animation after a specific delay to control the speed.
-    if time.ticks_diff(now, last_anim_update) > IDLE_BREATHE_SPEED_MS:
-        # Use a sine wave to generate a smooth curve for brightness changes.
-        brightness_normalized = (math.sin(rainbow_step * (math.pi / 128)) + 1) / 2
-        # Map the sine wave's output (0.0 to 1.0) to the configured min/max brightness range.
-        brightness = int(IDLE_BREATHE_MIN_BRIGHTNESS + brightness_normalized * (IDLE_BREATHE_MAX_BRIGHTNESS - IDLE_BREATHE_MIN_BRIGHTNESS))
-        set_pixels((0, brightness, 0)) # Set the green channel to the calculated brightness.
-        rainbow_step = (rainbow_step + 1) % 256 # Advance the position in the sine wave cycle.
-        last_anim_update = now
+    global rainbow_step, next_frame_time
+    # Look up the brightness on the precomputed sine curve; floating point is slow on the RP2040.
+    show_rgb(0, BREATHE_LUT[rainbow_step], 0) # Set the green channel to the brightness for this step.
+    rainbow_step = (rainbow_step + 1) % 256 # Advance the position in the sine wave cycle.
+    next_frame_time = time.ticks_add(time.ticks_ms(), IDLE_BREATHE_SPEED_MS + 1)
 
 def handle_chasing_rainbow_leds():
     """Creates a 'chasing' effect where rainbow colors move around the ring."""
-    global rainbow_step, last_anim_update
-    now = time.ticks_ms()
-    if time.ticks_diff(now, last_anim_update) > CHASING_RAINBOW_SPEED_MS:
-        for i in range(NUM_LEDS):
-            # Calculate the color for each pixel based on its position and the current rainbow step.
-            pixel_index = (i * 256 // NUM_LEDS) + rainbow_step
-            pixels[i] = wheel(pixel_index & 255)
-        pixels.write()
-        rainbow_step = (rainbow_step + 1) % 256 # Advance the rainbow, making it spin.
-        last_anim_update = now
+    global rainbow_step, next_frame_time, last_written_color
+    # Each pixel's color is based on its position and the current rainbow step.
+    render_chase(pixels.buf, rainbow_step)
+    pixels.write()
+    last_written_color = -1 # The strip is no longer one solid color.
+    rainbow_step = (rainbow_step + 1) % 256 # Advance the rainbow, making it spin.
+    next_frame_time = time.ticks_add(time.ticks_ms(), CHASING_RAINBOW_SPEED_MS + 1)
 
 def handle_cycling_color_leds():
     """Smoothly cycles all LEDs through the rainbow colors simultaneously."""
-    global rainbow_step, last_anim_update
-    now = time.ticks_ms()
-    if time.ticks_diff(now, last_anim_update) > CYCLING_COLOR_SPEED_MS:
-        color = wheel(rainbow_step & 255) # Get the next color in the sequence.
-        set_pixels(color) # Set all pixels to that color.
-        rainbow_step = (rainbow_step + 1) % 256 # Advance to the next color.
-        last_anim_update = now
+    global rainbow_step, next_frame_time
+    color = wheel(rainbow_step & 255) # Get the next color in the sequence.
+    show_rgb(color >> 16, (color >> 8) & 0xFF, color & 0xFF) # Set all pixels to that color.
+    rainbow_step = (rainbow_step + 1) % 256 # Advance to the next color.
+    next_frame_time = time.ticks_add(time.ticks_ms(), CYCLING_COLOR_SPEED_MS + 1)
 
+@micropython.native
 def handle_fading_flash_leds():
     """Handles the smooth fade-in and fade-out flashing effect for a given color."""
-    global flash_count_completed, flash_is_fading_in, flash_anim_start_time, current_state, post_flash_delay_start_time
+    global flash_count_completed, flash_is_fading_in, flash_anim_start_time, current_state, post_flash_delay_start_time, next_frame_time
 
     now = time.ticks_ms()
-    # Calculate how far along we are in the current fade animation.
+    # Calculate how far along we are in the current fade animation, in 1/256ths.
+    # Integer (8.8 fixed-point) math throughout, since floating point is emulated in software on the RP2040.
     elapsed = time.ticks_diff(now, flash_anim_start_time)
-    progress = min(elapsed / FLASH_FADE_DURATION_MS, 1.0) # Progress from 0.0 to 1.0.
+    progress = min(elapsed * 256 // FLASH_FADE_DURATION_MS, 256) # Progress from 0 to 256.
 
-    # If fading in, brightness goes from 0 to 1. If fading out, it goes from 1 to 0.
-    brightness = progress if flash_is_fading_in else 1.0 - progress
+    # If fading in, brightness goes from 0 to 256. If fading out, it goes from 256 to 0.
+    brightness = progress if flash_is_fading_in else 256 - progress
     
     # Calculate the current color based on the target color and the calculated brightness.
-    r = int(flash_color_target[0] * brightness)
-    g = int(flash_color_target[1] * brightness)
-    b = int(flash_color_target[2] * brightness)
-    set_pixels((r, g, b))
+    r = (flash_color_target[0] * brightness) >> 8
+    g = (flash_color_target[1] * brightness) >> 8
+    b = (flash_color_target[2] * brightness) >> 8
+    show_rgb(r, g, b)
 
     # Check if the current fade (in or out) is complete.
-    if progress >= 1.0:
+    if progress >= 256:
         flash_anim_start_time = now # Reset the timer for the next phase.
         
         if flash_is_fading_in:
@@ -188,9 +303,10 @@ def handle_fading_flash_leds():
             # Check if we have completed the required number of flashes.
             if flash_count_completed >= flash_target_count:
                 print("Flashing complete. Starting post-flash delay.")
-                set_pixels((0, 0, 0)) # Ensure LEDs are off.
-                current_state = "post_flash_delay" # Transition to the next state.
+                show_rgb(0, 0, 0) # Ensure LEDs are off.
+                current_state = STATE_POST_FLASH_DELAY # Transition to the next state.
                 post_flash_delay_start_time = now
+                next_frame_time = time.ticks_add(now, POST_FLASH_DELAY_MS) # Nothing to do until the delay is over.
 
 def handle_post_flash_delay():
     """Handles the dark period after flashing, before fading back to green."""
@@ -202,27 +318,29 @@ def handle_post_flash_delay():
     # Once the configured delay time has passed, move to the next state.
     if elapsed >= POST_FLASH_DELAY_MS:
         print("Post-flash delay complete. Fading to green...")
-        current_state = "fade_to_green"
+        current_state = STATE_FADE_TO_GREEN
         fade_to_green_start_time = now
 
+@micropython.native
 def handle_fade_to_green():
     """Handles the smooth transition from black to the idle green color."""
-    global current_state
+    global current_state, idle_written
     
     now = time.ticks_ms()
     elapsed = time.ticks_diff(now, fade_to_green_start_time)
-    progress = min(elapsed / FADE_TO_GREEN_DURATION_MS, 1.0)
+    progress = min(elapsed * 256 // FADE_TO_GREEN_DURATION_MS, 256) # In 1/256ths, like the flash fade.
     
     # Linearly interpolate each color channel from 0 to the target IDLE_COLOR value.
-    r = int(IDLE_COLOR[0] * progress)
-    g = int(IDLE_COLOR[1] * progress)
-    b = int(IDLE_COLOR[2] * progress)
-    set_pixels((r, g, b))
+    r = (IDLE_COLOR[0] * progress) >> 8
+    g = (IDLE_COLOR[1] * progress) >> 8
+    b = (IDLE_COLOR[2] * progress) >> 8
+    show_rgb(r, g, b)
     
     # When the fade is complete, switch back to the final 'idle' state.
-    if progress >= 1.0:
+    if progress >= 256:
         print("Fade to green complete. Entering idle state.")
-        current_state = "idle"
+        current_state = STATE_IDLE
+        idle_written = False
 
 # --- WIFI & MQTT FUNCTIONS ---
 def connect_wifi():
@@ -237,34 +355,36 @@ def connect_wifi():
             time.sleep(1)
     print(f"Connected! IP: {wlan.ifconfig()[0]}")
 
+@micropython.native
 def mqtt_callback(topic, msg):
     """Function that is called every time a message is received from the MQTT broker."""
-    global current_state, rainbow_step, flash_color_target, flash_count_completed, flash_is_fading_in, flash_anim_start_time, flash_target_count
+    global current_state, rainbow_step, flash_color_target, flash_count_completed, flash_is_fading_in, flash_anim_start_time, flash_target_count, idle_written, next_frame_time
     
     decoded_msg = msg.decode('utf-8')
     print(f"Received MQTT message: Topic='{topic.decode()}', Message='{decoded_msg}'")
     
+    # Look up the state once here, so the main loop only ever compares integers.
+    new_state = MQTT_STATES.get(decoded_msg)
+    if new_state is None:
+        # Any unrecognized flash command flashes white; anything else falls back to idle.
+        new_state = STATE_FLASH_WHITE if decoded_msg.startswith("flash_") else STATE_IDLE
+    
     # Only change the state if the new message is different from the current state.
-    if decoded_msg != current_state:
-        current_state = decoded_msg
+    if new_state != current_state:
+        current_state = new_state
         rainbow_step = 0 # Reset animation counters on state change.
+        idle_written = False
+        next_frame_time = time.ticks_ms() # Start the new animation straight away.
         
         # If the new state is a flash command, initialize the flash animation variables.
-        if current_state.startswith("flash_"):
+        if STATE_FLASH_RED <= current_state <= STATE_FLASH_WHITE:
             flash_count_completed = 0
             flash_is_fading_in = True
             flash_anim_start_time = time.ticks_ms()
             
             # Set the target color and flash count based on the specific message received.
-            if current_state == "flash_red":
-                flash_color_target = (255, 0, 0)
-                flash_target_count = FLASH_COUNT_RED
-            elif current_state == "flash_green":
-                flash_color_target = (0, 255, 0)
-                flash_target_count = FLASH_COUNT_GREEN
-            else: # Default case for "flash_white" or any other unrecognized flash command.
-                flash_color_target = (255, 255, 255)
-                flash_target_count = FLASH_COUNT_WHITE
+            # (Unrecognized flash commands were already mapped to STATE_FLASH_WHITE above.)
+            flash_color_target, flash_target_count = FLASH_PARAMS[current_state]
 
 def connect_mqtt():
     """Connects to the MQTT broker and subscribes to the 'wheel/state' topic."""
@@ -279,72 +399,82 @@ def connect_mqtt():
         print(f"Failed to connect to MQTT broker: {e}")
         time.sleep(5) # Wait before a potential retry.
 
-# =============================================================================
-# --- MAIN SCRIPT EXECUTION ---
-# =============================================================================
-try:
-    # This is the main entry point of the script.
-    print("Starting button script...")
-    connect_wifi()
-    connect_mqtt()
-
-    # Set the initial LED state based on the configuration.
-    if IDLE_BREATHING_EFFECT:
-        handle_breathing_idle_leds()
-    else:
-        handle_idle_leds()
-        
-    last_ping = time.ticks_ms()
+# --- BUTTON INPUT ---
+def handle_button_irq(pin):
+    """Interrupt handler for the button pin; just flags the press for the main loop to deal with."""
+    global button_pressed
+    button_pressed = True
+
+# Fire on the falling edge (not pressed -> pressed), so the main loop no longer has to poll the pin.
+button.irq(trigger=Pin.IRQ_FALLING, handler=handle_button_irq)
+
+# --- MAIN LOOP ---
+@micropython.native
+def run_main_loop():
+    """Runs the main loop forever: services MQTT, checks the button and advances the LED animation."""
+    global last_ping, button_pressed, debounce_time, next_frame_time
+
+    # Bind the functions called on every pass to local names once, so the loop doesn't
+    # repeat the global and attribute lookups each time round.
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+    sleep_ms = time.sleep_ms
+    read_button = button.value
+    check_msg = mqtt_client.check_msg
 
     # The main loop runs forever.
     while True:
         try:
-            now = time.ticks_ms()
+            now = ticks_ms()
             
             # This is essential. It checks for any incoming MQTT messages and calls the
             # mqtt_callback function if a message has arrived.
-            mqtt_client.check_msg()
+            check_msg()
 
             # Periodically send a keep-alive ping to the broker.
-            if time.ticks_diff(now, last_ping) > MQTT_PING_INTERVAL_MS:
+            if ticks_diff(now, last_ping) > MQTT_PING_INTERVAL_MS:
                 mqtt_client.ping()
                 last_ping = now
             
             # --- Handle Button Press ---
-            # Read the button's current state. It's 0 (False) when pressed due to the PULL_UP resistor.
-            is_pressed = button.value() == 0
-            # Check for a "falling edge" - a transition from not pressed to pressed.
-            # The debounce timer prevents a single physical press from registering multiple times.
-            if is_pressed and not last_button_state and time.ticks_diff(now, debounce_time) > 200:
-                print("Button Pressed! Publishing to 'wheel/spin'")
-                # Publish a message to the 'wheel/spin' topic to trigger the game.
-                mqtt_client.publish("wheel/spin", "pressed")
-                debounce_time = now # Reset the debounce timer.
-            # Remember the current button state for the next loop iteration.
-            last_button_state = is_pressed
+            # The interrupt handler has seen a "falling edge" - a transition from not pressed to pressed.
+            if button_pressed:
+                button_pressed = False
+                # The debounce timer prevents a single physical press from registering multiple times,
+                # and the pin must still read 0 (pressed, due to the PULL_UP resistor) so bounces on release are ignored.
+                if read_button() == 0 and ticks_diff(now, debounce_time) > 200:
+                    print("Button Pressed! Publishing to 'wheel/spin'")
+                    # Publish a message to the 'wheel/spin' topic to trigger the game.
+                    mqtt_client.publish("wheel/spin", "pressed")
+                    debounce_time = now # Reset the debounce timer.
 
             # --- State Machine: Update LEDs Based on current_state ---
-            # This block calls the appropriate animation handler for the current state.
-            if current_state == "spinning":
-                if SPIN_ANIMATION_MODE == 'chasing_rainbow':
-                    handle_chasing_rainbow_leds()
-                elif SPIN_ANIMATION_MODE == 'cycling_color':
-                    handle_cycling_color_leds()
-            elif current_state.startswith("flash_"):
-                handle_fading_flash_leds()
-            elif current_state == "post_flash_delay":
-                handle_post_flash_delay()
-            elif current_state == "fade_to_green":
-                handle_fade_to_green()
-            else: # The default state is "idle".
-                if IDLE_BREATHING_EFFECT:
-                    handle_breathing_idle_leds()
-                else:
-                    handle_idle_leds()
+            # This block calls the appropriate animation handler for the current state,
+            # but only once its next frame is due; most passes have nothing to draw.
+            if ticks_diff(now, next_frame_time) >= 0:
+                # Handlers that run every pass leave this alone; the timed ones push it ahead.
+                # Either way it stays close to now, so it can never fall a ticks wrap-around behind.
+                next_frame_time = now
+                if current_state == STATE_SPINNING:
+                    if SPIN_ANIMATION_MODE == 'chasing_rainbow':
+                        handle_chasing_rainbow_leds()
+                    elif SPIN_ANIMATION_MODE == 'cycling_color':
+                        handle_cycling_color_leds()
+                elif STATE_FLASH_RED <= current_state <= STATE_FLASH_WHITE:
+                    handle_fading_flash_leds()
+                elif current_state == STATE_POST_FLASH_DELAY:
+                    handle_post_flash_delay()
+                elif current_state == STATE_FADE_TO_GREEN:
+                    handle_fade_to_green()
+                else: # The default state is STATE_IDLE.
+                    if IDLE_BREATHING_EFFECT:
+                        handle_breathing_idle_leds()
+                    else:
+                        handle_idle_leds()
                     
             # A very short sleep to prevent the loop from consuming 100% CPU,
             # while still being highly responsive.
-            time.sleep_ms(1)
+            sleep_ms(1)
             
         except Exception as e:
             # If any error occurs within the main loop, print it and try to recover.
@@ -352,6 +482,27 @@ try:
             time.sleep(5)
             print("Attempting to reconnect...")
             connect_mqtt()
+            check_msg = mqtt_client.check_msg # Reconnecting creates a new client object.
+
+# =============================================================================
+# --- MAIN SCRIPT EXECUTION ---
+# =============================================================================
+try:
+    # This is the main entry point of the script.
+    print("Starting button script...")
+    connect_wifi()
+    connect_mqtt()
+
+    # Set the initial LED state based on the configuration.
+    if IDLE_BREATHING_EFFECT:
+        handle_breathing_idle_leds()
+    else:
+        handle_idle_leds()
+        
+    last_ping = time.ticks_ms()
+
+    # Hand over to the main loop, which is compiled to native code.
+    run_main_loop()
 finally:
     # This code runs when the script is stopped (e.g., with Ctrl+C).
     # It's important for cleanup.